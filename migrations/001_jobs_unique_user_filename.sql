@@ -0,0 +1,42 @@
+-- Adds uq_job_user_filename: a user can import a given filename only once.
+--
+-- Backs JobRepository.check_duplicate_file and lets create_job reject a concurrent
+-- duplicate upload atomically. Safe to run more than once.
+--
+-- Data change: jobs uploaded before the rule was enforced may share a (user, filename).
+-- The oldest job of each such group keeps its filename; the others are renamed to
+-- "<filename> (job <id>)" so the constraint can be added without deleting any job
+-- or its staging/issue data. Run a SELECT ... GROUP BY ... HAVING count(*) > 1
+-- beforehand if you want to see which jobs will be renamed.
+--
+-- Run with: psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/001_jobs_unique_user_filename.sql
+
+BEGIN;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'uq_job_user_filename' AND conrelid = 'jobs'::regclass
+    ) THEN
+        -- Keep the oldest job of each duplicate group under its filename and rename
+        -- the others to "<filename> (job <id>)", so no job or its staging/issue data is lost
+        UPDATE jobs AS j
+        SET job_original_filename = j.job_original_filename || ' (job ' || j.job_id || ')'
+        FROM (
+            SELECT job_id,
+                   row_number() OVER (
+                       PARTITION BY job_user_id, job_original_filename
+                       ORDER BY job_created_at, job_id
+                   ) AS rn
+            FROM jobs
+        ) AS d
+        WHERE j.job_id = d.job_id AND d.rn > 1;
+
+        ALTER TABLE jobs
+            ADD CONSTRAINT uq_job_user_filename UNIQUE (job_user_id, job_original_filename);
+    END IF;
+END
+$$;
+
+COMMIT;
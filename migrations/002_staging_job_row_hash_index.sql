@@ -0,0 +1,10 @@
+-- Adds ix_staging_job_hash: (staging_job_id, staging_row_hash) lookups on staging.
+--
+-- Non-unique on purpose: the worker stages every CSV line, including duplicates
+-- (reported as DUPLICATE_EMAIL issues). Built CONCURRENTLY so staging writes aren't
+-- blocked; it therefore can't run inside a transaction. Safe to run more than once.
+--
+-- Run with: psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/002_staging_job_row_hash_index.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_staging_job_hash
+    ON staging (staging_job_id, staging_row_hash);
@@ -0,0 +1,18 @@
+-- Adds composite indexes for the issue and staging list queries:
+--   ix_issues_job_resolved        issues (issues_job_id, issue_resolved)
+--   ix_issue_items_issue_staging  issue_items (item_issue_id, item_staging_id)
+--   ix_staging_job_status         staging (staging_job_id, staging_status)
+--
+-- Built CONCURRENTLY so writes aren't blocked; it therefore can't run inside a
+-- transaction. Safe to run more than once.
+--
+-- Run with: psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/003_composite_issue_staging_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_issues_job_resolved
+    ON issues (issues_job_id, issue_resolved);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_issue_items_issue_staging
+    ON issue_items (item_issue_id, item_staging_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_staging_job_status
+    ON staging (staging_job_id, staging_status);
@@ -5,14 +5,14 @@ Authentication and Authorization:
 - All endpoints require authentication via JWT token (Depends(get_current_user))
 - No group required (any authenticated user can access their own contacts)
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Response
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from src.app.db.database import get_db
 from src.app.auth.cognito_auth import get_current_user
 from src.app.repository.contact_repository import ContactRepository
-from src.schemas.contact import ContactListResponse, ContactResponse
+from src.schemas.contact import ContactListResponse, ContactResponse, CONTACT_LIST_ADAPTER
 from src.app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -114,10 +114,12 @@ def get_contacts(
             }
         )
         
-        return ContactListResponse(
+        # Same direct JSON response as the list branch below
+        response = ContactListResponse(
             contacts=[contact_response],
             total=1,
         )
+        return Response(content=response.model_dump_json(), media_type="application/json")
     else:
         # Get all contacts
         logger.info(
@@ -131,19 +133,7 @@ def get_contacts(
         contacts = ContactRepository.get_all_contacts_by_user_id(db, user_id, request_id)
         
         # Build response
-        contact_responses = [
-            ContactResponse(
-                contact_id=contact.contact_id,
-                staging_id=contact.staging_id,
-                contacts_user_id=contact.contacts_user_id,
-                contact_email=contact.contact_email,
-                contact_first_name=contact.contact_first_name,
-                contact_last_name=contact.contact_last_name,
-                contact_company=contact.contact_company,
-                contact_created_at=contact.contact_created_at,
-            )
-            for contact in contacts
-        ]
+        contact_responses = CONTACT_LIST_ADAPTER.validate_python(contacts, from_attributes=True)
         
         logger.info(
             "All contacts fetched successfully",
@@ -154,7 +144,10 @@ def get_contacts(
             }
         )
         
-        return ContactListResponse(
+        # Serialize here and return the JSON directly; the models are already validated,
+        # so FastAPI's response_model pass over every contact is skipped
+        response = ContactListResponse(
             contacts=contact_responses,
             total=len(contact_responses),
         )
+        return Response(content=response.model_dump_json(), media_type="application/json")
@@ -5,15 +5,18 @@ Authentication and Authorization:
 - GET endpoints require authentication via JWT token (Depends(get_current_user))
 - PUT endpoint requires authentication + "editor" group (Depends(require_group("editor")))
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Response
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from src.app.db.database import get_db
 from src.app.auth.cognito_auth import get_current_user, require_group
 from src.app.repository.job_repository import JobRepository
 from src.app.repository.issue_repository import IssueRepository
-from src.schemas.issue import IssueListResponse, IssueResponse, StagingRowResponse, IssueUpdateRequest
+from src.app.repository.pagination import decode_cursor, encode_cursor
+from src.schemas.issue import IssueListResponse, IssueResponse, JobIssueListResponse, IssueUpdateRequest, STAGING_ROW_LIST_ADAPTER
 from src.app.logging_config import get_logger
+from src.settings import settings
 
 logger = get_logger(__name__)
 
@@ -33,11 +36,14 @@ router = APIRouter(prefix="/issues", tags=["issues"])
     **Authorization**: No group required (any authenticated user can access their own issues)
     
     Returns issues with related staging rows (excluding staging_row_hash and issue_key for idempotency).
-    Issues are ordered by creation date (newest first).
+    Issues are ordered by creation date (newest first) and paginated: pass the returned
+    `next_cursor` as `cursor` to fetch the next page. Counts cover all of the user's issues.
     """
 )
 def get_all_user_issues(
     request: Request,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="Maximum number of issues to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor value from the previous page"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),  # ← AUTHENTICATION: Requires valid JWT token
 ):
@@ -49,13 +55,17 @@ def get_all_user_issues(
     
     Args:
         request: FastAPI request object (for request_id)
+        limit: Maximum number of issues to return
+        cursor: next_cursor of the previous page
         db: Database session
         current_user: Current authenticated user
         
     Returns:
-        IssueListResponse with issues, total count, resolved and unresolved counts
+        IssueListResponse with a page of issues, total count, resolved and unresolved counts,
+        and the cursor for the next page
         
     Raises:
+        HTTPException 400: If the cursor is malformed
         HTTPException 401: If authentication fails
     """
     request_id = getattr(request.state, "request_id", None)
@@ -69,27 +79,26 @@ def get_all_user_issues(
         }
     )
     
-    # Get all issues for all jobs belonging to the user
-    issues = IssueRepository.get_all_issues_by_user_id(db, user_id, request_id)
+    # Get one page of issues for all jobs belonging to the user
+    try:
+        seek = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    issues = IssueRepository.get_all_issues_by_user_id(
+        db, user_id, request_id, limit=limit, cursor=seek
+    )
+    # The page holds only part of the issues, so totals come from a COUNT query
     total, resolved, unresolved = IssueRepository.count_all_issues_by_user_id(db, user_id)
     
     # Build response with staging rows
     issue_responses = []
     for issue in issues:
-        # Get staging rows for this issue
-        affected_rows = []
-        for item in issue.issue_items:
-            if item.staging:
-                # Create staging response without staging_row_hash
-                affected_rows.append(StagingRowResponse(
-                    staging_id=item.staging.staging_id,
-                    staging_email=item.staging.staging_email,
-                    staging_first_name=item.staging.staging_first_name,
-                    staging_last_name=item.staging.staging_last_name,
-                    staging_company=item.staging.staging_company,
-                    staging_created_at=item.staging.staging_created_at,
-                    staging_status=item.staging.staging_status,
-                ))
+        # Staging rows for this issue; responses exclude staging_row_hash
+        affected_rows = STAGING_ROW_LIST_ADAPTER.validate_python(
+            [item.staging for item in issue.issue_items if item.staging],
+            from_attributes=True,
+        )
         
         # Create issue response without issue_key
         issue_responses.append(IssueResponse(
@@ -105,6 +114,11 @@ def get_all_user_issues(
             affected_rows=affected_rows,
         ))
     
+    next_cursor = (
+        encode_cursor(issue_responses[-1].issue_created_at, issue_responses[-1].issue_id)
+        if len(issue_responses) == limit else None
+    )
+    
     logger.info(
         "All issues fetched successfully",
         extra={
@@ -116,17 +130,21 @@ def get_all_user_issues(
         }
     )
     
-    return IssueListResponse(
+    # Serialize here and return the JSON directly; the models are already validated,
+    # so FastAPI's response_model pass over every issue and row is skipped
+    response = IssueListResponse(
         issues=issue_responses,
         total=total,
         resolved_count=resolved,
         unresolved_count=unresolved,
+        next_cursor=next_cursor,
     )
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
 @router.get(
     "/job/{job_id}",
-    response_model=IssueListResponse,
+    response_model=JobIssueListResponse,
     status_code=status.HTTP_200_OK,
     summary="Get issues for a job",
     description="""
@@ -157,7 +175,7 @@ def get_job_issues(
         current_user: Current authenticated user
         
     Returns:
-        IssueListResponse with issues, total count, resolved and unresolved counts
+        JobIssueListResponse with issues, total count, resolved and unresolved counts
         
     Raises:
         HTTPException 404: If job not found or user doesn't have access
@@ -193,25 +211,15 @@ def get_job_issues(
     
     # Get issues with staging rows
     issues = IssueRepository.get_issues_by_job_id(db, job_id, user_id, request_id)
-    total, resolved, unresolved = IssueRepository.count_issues_by_job_id(db, job_id, user_id)
     
     # Build response with staging rows
     issue_responses = []
     for issue in issues:
-        # Get staging rows for this issue
-        affected_rows = []
-        for item in issue.issue_items:
-            if item.staging:
-                # Create staging response without staging_row_hash
-                affected_rows.append(StagingRowResponse(
-                    staging_id=item.staging.staging_id,
-                    staging_email=item.staging.staging_email,
-                    staging_first_name=item.staging.staging_first_name,
-                    staging_last_name=item.staging.staging_last_name,
-                    staging_company=item.staging.staging_company,
-                    staging_created_at=item.staging.staging_created_at,
-                    staging_status=item.staging.staging_status,
-                ))
+        # Staging rows for this issue; responses exclude staging_row_hash
+        affected_rows = STAGING_ROW_LIST_ADAPTER.validate_python(
+            [item.staging for item in issue.issue_items if item.staging],
+            from_attributes=True,
+        )
         
         # Create issue response without issue_key
         issue_responses.append(IssueResponse(
@@ -227,6 +235,11 @@ def get_job_issues(
             affected_rows=affected_rows,
         ))
     
+    # Counts come from the issues already loaded; no separate COUNT query needed
+    total = len(issue_responses)
+    resolved = sum(1 for issue_response in issue_responses if issue_response.issue_resolved)
+    unresolved = total - resolved
+    
     logger.info(
         "Issues fetched successfully",
         extra={
@@ -238,12 +251,14 @@ def get_job_issues(
         }
     )
     
-    return IssueListResponse(
+    # Already validated; skip FastAPI's response_model pass (see get_all_user_issues)
+    response = JobIssueListResponse(
         issues=issue_responses,
         total=total,
         resolved_count=resolved,
         unresolved_count=unresolved,
     )
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
 @router.get(
@@ -313,19 +328,11 @@ def get_issue_details(
         )
     
     # Build response with staging rows
-    affected_rows = []
-    for item in issue.issue_items:
-        if item.staging:
-            # Create staging response without staging_row_hash
-            affected_rows.append(StagingRowResponse(
-                staging_id=item.staging.staging_id,
-                staging_email=item.staging.staging_email,
-                staging_first_name=item.staging.staging_first_name,
-                staging_last_name=item.staging.staging_last_name,
-                staging_company=item.staging.staging_company,
-                staging_created_at=item.staging.staging_created_at,
-                staging_status=item.staging.staging_status,
-            ))
+    # Staging responses exclude staging_row_hash
+    affected_rows = STAGING_ROW_LIST_ADAPTER.validate_python(
+        [item.staging for item in issue.issue_items if item.staging],
+        from_attributes=True,
+    )
     
     # Create issue response without issue_key
     issue_response = IssueResponse(
@@ -446,19 +453,11 @@ def update_issue(
     issue = IssueRepository.get_issue_by_id(db, issue_id, user_id, request_id)
     
     # Build response with staging rows
-    affected_rows = []
-    for item in issue.issue_items:
-        if item.staging:
-            # Create staging response without staging_row_hash
-            affected_rows.append(StagingRowResponse(
-                staging_id=item.staging.staging_id,
-                staging_email=item.staging.staging_email,
-                staging_first_name=item.staging.staging_first_name,
-                staging_last_name=item.staging.staging_last_name,
-                staging_company=item.staging.staging_company,
-                staging_created_at=item.staging.staging_created_at,
-                staging_status=item.staging.staging_status,
-            ))
+    # Staging responses exclude staging_row_hash
+    affected_rows = STAGING_ROW_LIST_ADAPTER.validate_python(
+        [item.staging for item in issue.issue_items if item.staging],
+        from_attributes=True,
+    )
     
     # Create issue response without issue_key
     issue_response = IssueResponse(
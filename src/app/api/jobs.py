@@ -5,18 +5,21 @@ Authentication and Authorization:
 - All endpoints require authentication via JWT token (Depends(get_current_user))
 - Some endpoints require specific Cognito groups (Depends(require_group("uploader")))
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFile, File
+import asyncio
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Response, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from src.app.db.database import get_db
+from src.app.db.database import SessionLocal, get_db
 from src.app.auth.cognito_auth import get_current_user, require_group
-from src.app.repository.job_repository import JobRepository
-from src.schemas.job import JobResponse, JobListResponse, JobReprocessResponse
+from src.app.repository.job_repository import JobRepository, JOB_NOT_DELETABLE_MESSAGE
+from src.app.repository.pagination import decode_cursor, encode_cursor
+from src.models.job import JobStatus
+from src.schemas.job import JobListResponse, JobReprocessResponse, JOB_LIST_ADAPTER
 from src.schemas.upload import UploadResponse, UploadErrorResponse
 from src.app.services.csv_validator import csv_validator
-from src.app.services.s3_service import s3_service
-from src.app.services.sqs_service import sqs_service
+from src.app.services.s3_service import S3Service, get_s3_service
+from src.app.services.sqs_service import SQSService, get_sqs_service
 from src.app.logging_config import get_logger
 from src.settings import settings
 
@@ -26,6 +29,71 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
+async def _publish_upload_message(
+    sqs_service: SQSService,
+    job_id: int,
+    s3_key: str,
+    request_id: Optional[str] = None
+) -> None:
+    """
+    Publish the processing message for a newly uploaded job (runs as a background task).
+    
+    The upload response has already been sent, so a failed publish can't be
+    reported to the client; the job is marked FAILED instead, which lets the
+    user reprocess or delete it.
+    
+    Args:
+        sqs_service: SQS service to publish with
+        job_id: Job ID to publish
+        s3_key: S3 object key of the uploaded CSV
+        request_id: Request ID for logging traceability
+    """
+    logger.info(
+        "Publishing message to SQS",
+        extra={
+            "request_id": request_id,
+            "job_id": job_id,
+            "s3_key": s3_key,
+        }
+    )
+    
+    try:
+        await sqs_service.publish_job_message_async(job_id=job_id, s3_key=s3_key)
+        return
+    except Exception as e:
+        logger.error(
+            "SQS publish failed - marking job as FAILED",
+            extra={
+                "request_id": request_id,
+                "job_id": job_id,
+                "s3_key": s3_key,
+                "error": str(e),
+            },
+            exc_info=True
+        )
+    
+    # The request's session is closed by now; use a dedicated one
+    def mark_failed() -> None:
+        db = SessionLocal()
+        try:
+            JobRepository.update_job_status(db, job_id, JobStatus.FAILED, request_id)
+        finally:
+            db.close()
+    
+    try:
+        await asyncio.to_thread(mark_failed)
+    except Exception as update_error:
+        logger.error(
+            "Failed to mark job as FAILED after SQS publish failure",
+            extra={
+                "request_id": request_id,
+                "job_id": job_id,
+                "error": str(update_error),
+            },
+            exc_info=True
+        )
+
+
 @router.get(
     "",
     response_model=JobListResponse,
@@ -38,10 +106,14 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
     **Authorization**: No group required (any authenticated user can access their own jobs)
     
     Returns only jobs owned by the authenticated user (filtered by user_id from JWT token).
+    Jobs are ordered by creation date (newest first) and paginated: pass the returned
+    `next_cursor` as `cursor` to fetch the next page.
     """
 )
 def get_all_jobs(
     request: Request,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE, description="Maximum number of jobs to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor value from the previous page"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),  # ← AUTHENTICATION: Requires valid JWT token
 ):
@@ -52,11 +124,16 @@ def get_all_jobs(
     
     Args:
         request: FastAPI request object (for request_id)
+        limit: Maximum number of jobs to return
+        cursor: next_cursor of the previous page
         db: Database session
         current_user: Current authenticated user
         
     Returns:
-        List of jobs with total count
+        Page of jobs with total count and the cursor for the next page
+        
+    Raises:
+        HTTPException 400: If the cursor is malformed
     """
     request_id = getattr(request.state, "request_id", None)
     user_id = current_user["user_id"]
@@ -70,9 +147,19 @@ def get_all_jobs(
         }
     )
     
-    # Get all jobs for the user
-    jobs = JobRepository.get_all_jobs(db, user_id=user_id, request_id=request_id)
+    try:
+        seek = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Get one page of jobs for the user
+    jobs = JobRepository.get_all_jobs(
+        db, user_id=user_id, request_id=request_id, limit=limit, cursor=seek
+    )
     total = JobRepository.count_jobs(db, user_id=user_id)
+    next_cursor = (
+        encode_cursor(jobs[-1].job_created_at, jobs[-1].job_id) if len(jobs) == limit else None
+    )
     
     # Log response with structured data
     logger.info(
@@ -84,10 +171,14 @@ def get_all_jobs(
         }
     )
     
-    return JobListResponse(
-        jobs=[JobResponse.model_validate(job) for job in jobs],
+    # Serialize here and return the JSON directly; the models are already validated,
+    # so FastAPI's response_model pass over every job is skipped
+    response = JobListResponse(
+        jobs=JOB_LIST_ADAPTER.validate_python(jobs, from_attributes=True),
         total=total,
+        next_cursor=next_cursor,
     )
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
 @router.post(
@@ -106,19 +197,21 @@ def get_all_jobs(
     2. Validates CSV file (format, size < 5MB, not empty, has data)
     3. **Validates CSV headers** (required: email, first_name, last_name, company)
        - Header validation is case-insensitive and supports variations (e.g., "nome" for first_name, "empresa" for company)
-       - Automatically tries multiple encodings (UTF-8, Latin-1, CP1252, ISO-8859-1, Windows-1252) and delimiters (semicolon, comma, tab)
+       - Automatically detects the encoding (UTF-8/UTF-16 with BOM, UTF-8, otherwise CP1252/Latin-1) and tries multiple delimiters (semicolon, comma, tab)
        - If headers are missing, upload is rejected before S3 upload or SQS message
     4. Checks for duplicate files
-    5. Uploads file to S3 (only if all validations pass)
-    6. Creates job record in database
-    7. Publishes message to SQS queue for worker processing
-    8. Returns job ID and file information
+    5. Uploads file to S3 and creates the job record in database, concurrently (only if all validations pass)
+    6. Publishes message to SQS queue for worker processing (after the response is sent; on failure the job is marked FAILED)
+    7. Returns job ID and file information
     """
 )
 async def upload_csv(
     request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
+    s3_service: S3Service = Depends(get_s3_service),
+    sqs_service: SQSService = Depends(get_sqs_service),
     current_user: dict = Depends(require_group("uploader")),  # ← Requires "uploader" group
 ):
     """
@@ -127,9 +220,10 @@ async def upload_csv(
     This endpoint follows the upload flow specified in AGENT.md:
     1. Validate JWT token and verify IAM role (uploader)
     2. Pre-validate CSV file (format, size, headers, duplicate check, empty check)
-    3. Upload CSV to S3 private bucket (only if all validations pass)
-    4. Create job record in jobs table (status: PENDING)
-    5. Publish message to SQS queue (only if all validations pass)
+    3. Upload CSV to S3 private bucket (only if all validations pass) while
+    4. creating the job record in jobs table (status: PENDING); either side is
+       rolled back if the other fails
+    5. Publish message to SQS queue in the background (job marked FAILED if it can't be sent)
     6. Return job_id to frontend
     
     **CSV Header Validation**:
@@ -140,7 +234,7 @@ async def upload_csv(
     - `company` (variations: company, empresa, organization, org, company_name)
     
     The validation automatically handles:
-    - Multiple encodings: UTF-8, Latin-1, CP1252, ISO-8859-1, Windows-1252
+    - Multiple encodings: UTF-8/UTF-16 with BOM, UTF-8, otherwise CP1252 (superset of Latin-1/ISO-8859-1)
     - Multiple delimiters: semicolon (;), comma (,), tab (\\t)
     - Case-insensitive header matching
     - Whitespace trimming
@@ -150,8 +244,11 @@ async def upload_csv(
     
     Args:
         request: FastAPI request object (for request_id)
+        background_tasks: Runs the SQS publish after the response is sent
         file: CSV file to upload
         db: Database session
+        s3_service: S3 service for storing the file
+        sqs_service: SQS service for queueing the job
         current_user: Current authenticated user (must belong to "uploader" group)
         
     Returns:
@@ -206,41 +303,15 @@ async def upload_csv(
                 detail=f"File '{file.filename}' has already been imported. Please use a different filename."
             )
         
-        # Step 4: Upload CSV to S3
+        # Step 4: Upload CSV to S3 and create the job record concurrently.
+        # The object key is generated up front so both can start at once; whichever
+        # side fails, the other is cleaned up before responding. Meanwhile the PENDING
+        # job can briefly show up in GET /jobs before its S3 object exists; that is
+        # acceptable, since the worker only sees the job once the SQS message is sent
+        # (after both succeed), and the cleanup delete invalidates the user's cached lists.
+        s3_key = s3_service.build_object_key(file.filename, user_id)
         logger.info(
-            "Uploading file to S3",
-            extra={
-                "request_id": request_id,
-                "user_id": user_id,
-                "file_name": file.filename,
-            }
-        )
-        
-        try:
-            s3_key = s3_service.upload_csv_file(
-                file_content=file_content,
-                original_filename=file.filename,
-                user_id=user_id
-            )
-        except Exception as e:
-            logger.error(
-                "S3 upload failed",
-                extra={
-                    "request_id": request_id,
-                    "user_id": user_id,
-                    "file_name": file.filename,
-                    "error": str(e),
-                },
-                exc_info=True
-            )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to upload file to storage: {str(e)}"
-            )
-        
-        # Step 5: Create job record in database
-        logger.info(
-            "Creating job record",
+            "Uploading file to S3 and creating job record",
             extra={
                 "request_id": request_id,
                 "user_id": user_id,
@@ -250,96 +321,75 @@ async def upload_csv(
             }
         )
         
-        try:
-            job = JobRepository.create_job(
+        upload_result, job_result = await asyncio.gather(
+            s3_service.upload_csv_file_async(
+                file_content=file_content,
+                original_filename=file.filename,
+                user_id=user_id,
+                s3_key=s3_key
+            ),
+            asyncio.to_thread(
+                JobRepository.create_job,
                 db=db,
                 user_id=user_id,
                 original_filename=file.filename,
                 s3_object_key=s3_key,
                 total_rows=total_rows,
                 request_id=request_id
-            )
-        except Exception as e:
+            ),
+            return_exceptions=True
+        )
+        job = None if isinstance(job_result, BaseException) else job_result
+        
+        if isinstance(upload_result, BaseException):
             logger.error(
-                "Job creation failed",
+                "S3 upload failed",
                 extra={
                     "request_id": request_id,
                     "user_id": user_id,
                     "file_name": file.filename,
-                    "s3_key": s3_key,
-                    "error": str(e),
+                    "error": str(upload_result),
                 },
-                exc_info=True
+                exc_info=upload_result
             )
-            # Note: File is already in S3, but job creation failed
-            # In production, you might want to clean up the S3 file here
+            if job is not None:
+                try:
+                    await asyncio.to_thread(JobRepository.delete_job, db, job.job_id, request_id)
+                except Exception as delete_error:
+                    logger.error(
+                        "Failed to delete job after S3 upload failure",
+                        extra={
+                            "request_id": request_id,
+                            "job_id": job.job_id,
+                            "error": str(delete_error),
+                        },
+                        exc_info=True
+                    )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create job record: {str(e)}"
+                detail=f"Failed to upload file to storage: {str(upload_result)}"
             )
         
-        # Step 6: Publish message to SQS queue
-        logger.info(
-            "Publishing message to SQS",
-            extra={
-                "request_id": request_id,
-                "job_id": job.job_id,
-                "s3_key": s3_key,
-            }
-        )
-        
-        try:
-            sqs_service.publish_job_message(
-                job_id=job.job_id,
-                s3_key=s3_key
-            )
-        except Exception as e:
-            error_message = str(e)
-            logger.error(
-                "SQS publish failed - rolling back job and S3 file",
-                extra={
-                    "request_id": request_id,
-                    "job_id": job.job_id,
-                    "s3_key": s3_key,
-                    "error": error_message,
-                },
-                exc_info=True
-            )
-            
-            # Rollback: Delete job from database
-            try:
-                JobRepository.delete_job(db, job.job_id, request_id)
-                logger.info(
-                    "Job deleted during rollback",
-                    extra={
-                        "request_id": request_id,
-                        "job_id": job.job_id,
-                    }
-                )
-            except Exception as delete_error:
+        if job is None:
+            if isinstance(job_result, BaseException):
                 logger.error(
-                    "Failed to delete job during rollback",
+                    "Job creation failed",
                     extra={
                         "request_id": request_id,
-                        "job_id": job.job_id,
-                        "error": str(delete_error),
+                        "user_id": user_id,
+                        "file_name": file.filename,
+                        "s3_key": s3_key,
+                        "error": str(job_result),
                     },
-                    exc_info=True
+                    exc_info=job_result
                 )
-            
-            # Rollback: Delete file from S3
+            # Either the insert failed or a concurrent upload of the same filename
+            # won it; the S3 copy is orphaned in both cases
             try:
-                s3_service.delete_file(s3_key)
-                logger.info(
-                    "S3 file deleted during rollback",
-                    extra={
-                        "request_id": request_id,
-                        "s3_key": s3_key,
-                    }
-                )
+                await s3_service.delete_file_async(s3_key)
             except Exception as delete_error:
                 logger.error(
-                    "Failed to delete S3 file during rollback",
+                    "Failed to delete S3 file after job creation was rejected",
                     extra={
                         "request_id": request_id,
                         "s3_key": s3_key,
@@ -347,27 +397,27 @@ async def upload_csv(
                     },
                     exc_info=True
                 )
-            
-            # Raise HTTPException to inform the user
-            if "does not exist" in error_message or "NonExistentQueue" in error_message:
+            if isinstance(job_result, BaseException):
                 raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=(
-                        f"SQS queue does not exist. "
-                        f"Please create the SQS queue or fix SQS_QUEUE_URL environment variable. "
-                        f"Upload has been rolled back."
-                    )
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=(
-                        f"Failed to publish message to SQS queue. "
-                        f"Upload has been rolled back. Error: {error_message}"
-                    )
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to create job record: {str(job_result)}"
                 )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"File '{file.filename}' has already been imported. Please use a different filename."
+            )
+
+        # Step 5: Publish message to SQS queue after the response is sent;
+        # failures mark the job FAILED (see _publish_upload_message)
+        background_tasks.add_task(
+            _publish_upload_message,
+            sqs_service=sqs_service,
+            job_id=job.job_id,
+            s3_key=s3_key,
+            request_id=request_id,
+        )
         
-        # Step 7: Return success response (only reached if SQS publish succeeds)
+        # Step 6: Return success response
         logger.info(
             "CSV upload completed successfully",
             extra={
@@ -423,6 +473,7 @@ def reprocess_job(
     request: Request,
     job_id: int,
     db: Session = Depends(get_db),
+    sqs_service: SQSService = Depends(get_sqs_service),
     current_user: dict = Depends(require_group("uploader")),  # ← Requires "uploader" group
 ):
     """
@@ -435,6 +486,7 @@ def reprocess_job(
         request: FastAPI request object (for request_id)
         job_id: Job ID to reprocess
         db: Database session
+        sqs_service: SQS service for queueing the job
         current_user: Current authenticated user
         
     Returns:
@@ -561,6 +613,7 @@ def cancel_job(
     request: Request,
     job_id: int,
     db: Session = Depends(get_db),
+    s3_service: S3Service = Depends(get_s3_service),
     current_user: dict = Depends(require_group("editor")),  # ← Requires "editor" group
 ):
     """
@@ -573,6 +626,7 @@ def cancel_job(
         request: FastAPI request object (for request_id)
         job_id: Job ID to cancel/delete
         db: Database session
+        s3_service: S3 service for deleting the file
         current_user: Current authenticated user
         
     Returns:
@@ -597,37 +651,10 @@ def cancel_job(
         }
     )
     
-    # Verify job can be deleted (ownership and status check)
-    can_delete, job, error_message = JobRepository.can_delete_job(db, job_id, user_id, request_id)
-    
-    if not can_delete:
-        if job is None:
-            # Job not found or access denied
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=error_message
-            )
-        else:
-            # Job found but status doesn't allow deletion
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=error_message
-            )
-    
-    # Get S3 key before deleting job
-    s3_key = job.job_s3_object_key
-    
-    # Step 1: Delete job from database (CASCADE will delete staging, issues, issue_items)
+    # Step 1: Delete job if owned by user and status allows it, in a single atomic statement
+    # (CASCADE will delete staging, issues, issue_items)
     try:
-        JobRepository.delete_job(db, job_id, request_id)
-        logger.info(
-            "Job deleted from database",
-            extra={
-                "request_id": request_id,
-                "job_id": job_id,
-                "user_id": user_id,
-            }
-        )
+        deleted, job_status, s3_key = JobRepository.try_delete_job(db, job_id, user_id, request_id)
     except Exception as e:
         logger.error(
             "Failed to delete job from database",
@@ -644,6 +671,29 @@ def cancel_job(
             detail=f"Failed to delete job from database: {str(e)}"
         )
     
+    if not deleted:
+        if job_status is None:
+            # Job not found or access denied
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found or you don't have access to it"
+            )
+        else:
+            # Job found but status doesn't allow deletion
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=JOB_NOT_DELETABLE_MESSAGE.format(job_status.value)
+            )
+    
+    logger.info(
+        "Job deleted from database",
+        extra={
+            "request_id": request_id,
+            "job_id": job_id,
+            "user_id": user_id,
+        }
+    )
+    
     # Step 2: Delete file from S3
     try:
         s3_service.delete_file(s3_key)
@@ -32,38 +32,46 @@ def get_cognito_public_keys():
         )
 
 
+@lru_cache(maxsize=1)
+def get_cognito_signing_keys() -> dict:
+    """
+    Build a {kid: public_key} mapping from the Cognito JWKS.
+    Cached so each key is parsed once instead of on every request.
+    """
+    keys = get_cognito_public_keys()
+    return {
+        key["kid"]: jwt.algorithms.RSAAlgorithm.from_jwk(key)
+        for key in keys.get("keys", [])
+        if key.get("kid")
+    }
+
+
 def get_public_key(token: str):
     """
     Get the appropriate public key for JWT verification.
     """
     try:
-        # Decode token header to get key ID
-        unverified_header = jwt.get_unverified_header(token)
-        kid = unverified_header.get("kid")
-        
-        if not kid:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token missing key ID"
-            )
-        
-        # Get public keys
-        keys = get_cognito_public_keys()
-        
-        # Find the matching key
-        for key in keys.get("keys", []):
-            if key.get("kid") == kid:
-                return jwt.algorithms.RSAAlgorithm.from_jwk(key)
-        
+        kid = jwt.get_unverified_header(token).get("kid")
+    except jwt.InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Unable to find matching public key"
+            detail=f"Invalid token header: {str(e)}"
         )
-    except Exception as e:
+    
+    if not kid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Error getting public key: {str(e)}"
+            detail="Token missing key ID"
         )
+    
+    public_key = get_cognito_signing_keys().get(kid)
+    if public_key is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Unable to find matching public key"
+        )
+    
+    return public_key
 
 
 def verify_token(token: str) -> dict:
@@ -129,6 +137,9 @@ def verify_token(token: str) -> dict:
                 )
         
         return payload
+    except HTTPException:
+        # Already carries the right status/detail (e.g. unknown kid, JWKS unavailable)
+        raise
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,6 +1,7 @@
 """
 Structured logging configuration for CloudWatch compatibility.
 """
+import itertools
 import json
 import logging
 import sys
@@ -10,6 +11,11 @@ import os
 
 from src.settings import settings
 
+# Expected AWS errors attach a traceback only to the first and every Nth occurrence
+EXC_INFO_SAMPLE_RATE = 100
+
+_exc_info_counters: Dict[str, "itertools.count"] = {}
+
 
 class CloudWatchJSONFormatter(logging.Formatter):
     """
@@ -122,3 +128,27 @@ def get_logger(name: str) -> logging.Logger:
         Logger instance
     """
     return logging.getLogger(name)
+
+
+def sampled_exc_info(key: str) -> bool:
+    """
+    Decide whether an error log should carry a traceback.
+    
+    Formatting tracebacks is the expensive part of error logging; during an error
+    storm (e.g. S3/SQS throttling) the same failure is logged thousands of times.
+    Per key, only the first and every EXC_INFO_SAMPLE_RATE-th call return True,
+    unless DEBUG logging is enabled.
+    
+    Args:
+        key: Identifies the error site (typically the log message)
+        
+    Returns:
+        Value to pass as exc_info
+    """
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        return True
+    counter = _exc_info_counters.get(key)
+    if counter is None:
+        counter = _exc_info_counters.setdefault(key, itertools.count())
+    # next() on itertools.count is atomic under the GIL
+    return next(counter) % EXC_INFO_SAMPLE_RATE == 0
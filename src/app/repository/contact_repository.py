@@ -1,9 +1,10 @@
 """
 Repository for contact data access operations.
 """
+import logging
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 
 from src.models.contact import Contact
 from src.app.logging_config import get_logger
@@ -32,21 +33,22 @@ class ContactRepository:
             List of Contact objects, ordered by creation date (newest first)
         """
         # Filter contacts directly by contacts_user_id (no join needed)
-        contacts = (
-            db.query(Contact)
-            .filter(Contact.contacts_user_id == user_id)
+        stmt = (
+            select(Contact)
+            .where(Contact.contacts_user_id == user_id)
             .order_by(desc(Contact.contact_created_at))
-            .all()
         )
+        contacts = db.execute(stmt).scalars().all()
         
-        logger.debug(
-            "All contacts query completed for user",
-            extra={
-                "request_id": request_id,
-                "user_id": user_id,
-                "contact_count": len(contacts),
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "All contacts query completed for user",
+                extra={
+                    "request_id": request_id,
+                    "user_id": user_id,
+                    "contact_count": len(contacts),
+                }
+            )
         
         return contacts
     
@@ -71,14 +73,11 @@ class ContactRepository:
             Contact object, or None if not found or access denied
         """
         # Get contact by email, filtering directly on contacts_user_id (no join needed)
-        contact = (
-            db.query(Contact)
-            .filter(
-                Contact.contact_email == email,
-                Contact.contacts_user_id == user_id
-            )
-            .first()
+        stmt = select(Contact).where(
+            Contact.contact_email == email,
+            Contact.contacts_user_id == user_id
         )
+        contact = db.execute(stmt).scalars().first()
         
         if not contact:
             logger.warning(
@@ -91,14 +90,15 @@ class ContactRepository:
             )
             return None
         
-        logger.debug(
-            "Contact query completed",
-            extra={
-                "request_id": request_id,
-                "email": email,
-                "user_id": user_id,
-                "contact_id": contact.contact_id,
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Contact query completed",
+                extra={
+                    "request_id": request_id,
+                    "email": email,
+                    "user_id": user_id,
+                    "contact_id": contact.contact_id,
+                }
+            )
         
         return contact
@@ -1,15 +1,47 @@
 """
 Repository for issue data access operations.
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import bindparam, case, desc, func, select, tuple_, update
 
 from src.models.issue import Issue, IssueItem, Staging
+from src.models.job import Job
+from src.app.repository.query_cache import cached_query, invalidate_user
 from src.app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Reusable base statement: issues with their items and staging rows.
+# select() statements are immutable, so methods extend this per call and
+# SQLAlchemy's compiled cache recognizes the shared structure.
+_ISSUES_WITH_ROWS = select(Issue).options(
+    # Load issue_items in a separate IN query (avoids a row explosion), staging joined per item
+    selectinload(Issue.issue_items).joinedload(IssueItem.staging)
+)
+
+# Issue detail lookup, built once; issue_id and user_id are bound per call
+_ISSUE_BY_ID_STMT = (
+    _ISSUES_WITH_ROWS
+    .join(Job, Issue.issues_job_id == Job.job_id)
+    .where(
+        Issue.issue_id == bindparam("issue_id"),
+        Job.job_user_id == bindparam("user_id")
+    )
+)
+
+# Total and resolved issue counts of a user's jobs in one aggregate; user_id is bound per call
+_USER_ISSUE_COUNTS_STMT = (
+    select(
+        func.count(Issue.issue_id),
+        func.count(Issue.issue_id).filter(Issue.issue_resolved == True),
+    )
+    .join(Job, Issue.issues_job_id == Job.job_id)
+    .where(Job.job_user_id == bindparam("user_id"))
+)
+
 
 class IssueRepository:
     """Repository for issue operations."""
@@ -33,132 +65,92 @@ class IssueRepository:
         Returns:
             List of Issue objects with loaded relationships
         """
-        # First verify job exists and belongs to user (if user_id provided)
-        from src.models.job import Job
-        
-        query = db.query(Job).filter(Job.job_id == job_id)
+        # Ownership is verified by the join: a missing job, a job owned by
+        # someone else, and a job without issues all return an empty list
+        stmt = (
+            _ISSUES_WITH_ROWS
+            .join(Job, Issue.issues_job_id == Job.job_id)
+            .where(Job.job_id == job_id)
+            .order_by(desc(Issue.issue_created_at))
+        )
         if user_id:
-            query = query.filter(Job.job_user_id == user_id)
+            stmt = stmt.where(Job.job_user_id == user_id)
         
-        job = query.first()
-        if not job:
-            logger.warning(
-                "Job not found or access denied",
+        issues = db.execute(stmt).scalars().all()
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Issues query completed",
                 extra={
                     "request_id": request_id,
                     "job_id": job_id,
-                    "user_id": user_id,
+                    "issue_count": len(issues),
                 }
             )
-            return []
-        
-        # Get all issues for the job with relationships loaded using eager loading
-        # This avoids N+1 queries by loading all related data in a single query
-        issues = (
-            db.query(Issue)
-            .filter(Issue.issues_job_id == job_id)
-            .options(
-                # Eagerly load issue_items and their staging relationships
-                joinedload(Issue.issue_items).joinedload(IssueItem.staging)
-            )
-            .order_by(desc(Issue.issue_created_at))
-            .all()
-        )
-        
-        logger.debug(
-            "Issues query completed",
-            extra={
-                "request_id": request_id,
-                "job_id": job_id,
-                "issue_count": len(issues),
-            }
-        )
         
         return issues
     
-    @staticmethod
-    def count_issues_by_job_id(
-        db: Session,
-        job_id: int,
-        user_id: Optional[str] = None
-    ) -> tuple[int, int, int]:
-        """
-        Count total, resolved, and unresolved issues for a job.
-        
-        Args:
-            db: Database session
-            job_id: Job ID
-            user_id: Optional user ID to verify job ownership
-            
-        Returns:
-            Tuple of (total_count, resolved_count, unresolved_count)
-        """
-        # Verify job exists and belongs to user (if user_id provided)
-        from src.models.job import Job
-        
-        query = db.query(Job).filter(Job.job_id == job_id)
-        if user_id:
-            query = query.filter(Job.job_user_id == user_id)
-        
-        job = query.first()
-        if not job:
-            return (0, 0, 0)
-        
-        # Count issues
-        total = db.query(Issue).filter(Issue.issues_job_id == job_id).count()
-        resolved = db.query(Issue).filter(
-            Issue.issues_job_id == job_id,
-            Issue.issue_resolved == True
-        ).count()
-        unresolved = total - resolved
-        
-        return (total, resolved, unresolved)
-    
     @staticmethod
     def get_all_issues_by_user_id(
         db: Session,
         user_id: str,
-        request_id: Optional[str] = None
+        request_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, int]] = None
     ) -> List[Issue]:
         """
         Get all issues for all jobs belonging to a specific user, with related staging rows.
         
+        Supports keyset pagination: pass the (issue_created_at, issue_id) of the last
+        issue of the previous page as `cursor` to get the issues created before it.
+        
         Args:
             db: Database session
             user_id: User ID to filter jobs
             request_id: Request ID for logging traceability
+            limit: Optional maximum number of issues to return
+            cursor: Optional (issue_created_at, issue_id) of the last issue already returned
             
         Returns:
             List of Issue objects with loaded relationships, ordered by creation date (newest first)
         """
-        from src.models.job import Job
-        
         # Get all issues for jobs belonging to the user with relationships loaded using eager loading
-        # This avoids N+1 queries by loading all related data in a single query
-        issues = (
-            db.query(Issue)
+        # This avoids N+1 queries with one extra query for all related data
+        stmt = (
+            _ISSUES_WITH_ROWS
             .join(Job, Issue.issues_job_id == Job.job_id)
-            .filter(Job.job_user_id == user_id)
-            .options(
-                # Eagerly load issue_items and their staging relationships
-                joinedload(Issue.issue_items).joinedload(IssueItem.staging)
-            )
-            .order_by(desc(Issue.issue_created_at))
-            .all()
+            .where(Job.job_user_id == user_id)
         )
         
-        logger.debug(
-            "All issues query completed for user",
-            extra={
-                "request_id": request_id,
-                "user_id": user_id,
-                "issue_count": len(issues),
-            }
-        )
+        if cursor is not None:
+            # Seek past the cursor's sort key (valid even if that issue was deleted);
+            # issue_id breaks ties, since the worker creates a job's issues in one
+            # transaction with the same timestamp
+            cursor_created_at, cursor_issue_id = cursor
+            stmt = stmt.where(
+                tuple_(Issue.issue_created_at, Issue.issue_id) < tuple_(cursor_created_at, cursor_issue_id)
+            )
+        
+        stmt = stmt.order_by(desc(Issue.issue_created_at), desc(Issue.issue_id))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        issues = db.execute(stmt).scalars().all()
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "All issues query completed for user",
+                extra={
+                    "request_id": request_id,
+                    "user_id": user_id,
+                    "issue_count": len(issues),
+                }
+            )
         
         return issues
     
     @staticmethod
+    @cached_query()
     def count_all_issues_by_user_id(
         db: Session,
         user_id: str
@@ -173,24 +165,8 @@ class IssueRepository:
         Returns:
             Tuple of (total_count, resolved_count, unresolved_count)
         """
-        from src.models.job import Job
-        
-        # Count issues for all jobs belonging to the user
-        total = (
-            db.query(Issue)
-            .join(Job, Issue.issues_job_id == Job.job_id)
-            .filter(Job.job_user_id == user_id)
-            .count()
-        )
-        resolved = (
-            db.query(Issue)
-            .join(Job, Issue.issues_job_id == Job.job_id)
-            .filter(
-                Job.job_user_id == user_id,
-                Issue.issue_resolved == True
-            )
-            .count()
-        )
+        # Count total and resolved issues for all jobs belonging to the user in one query
+        total, resolved = db.execute(_USER_ISSUE_COUNTS_STMT, {"user_id": user_id}).one()
         unresolved = total - resolved
         
         return (total, resolved, unresolved)
@@ -215,22 +191,10 @@ class IssueRepository:
         Returns:
             Issue object with loaded relationships, or None if not found or access denied
         """
-        from src.models.job import Job
-        
         # Get issue with job join to verify ownership
-        issue = (
-            db.query(Issue)
-            .join(Job, Issue.issues_job_id == Job.job_id)
-            .filter(
-                Issue.issue_id == issue_id,
-                Job.job_user_id == user_id
-            )
-            .options(
-                # Eagerly load issue_items and their staging relationships
-                joinedload(Issue.issue_items).joinedload(IssueItem.staging)
-            )
-            .first()
-        )
+        issue = db.execute(
+            _ISSUE_BY_ID_STMT, {"issue_id": issue_id, "user_id": user_id}
+        ).scalar_one_or_none()
         
         if not issue:
             logger.warning(
@@ -243,14 +207,15 @@ class IssueRepository:
             )
             return None
         
-        logger.debug(
-            "Issue query completed",
-            extra={
-                "request_id": request_id,
-                "issue_id": issue_id,
-                "user_id": user_id,
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Issue query completed",
+                extra={
+                    "request_id": request_id,
+                    "issue_id": issue_id,
+                    "user_id": user_id,
+                }
+            )
         
         return issue
     
@@ -282,38 +247,68 @@ class IssueRepository:
         Returns:
             Updated Issue object, or None if not found or access denied
         """
-        from datetime import datetime
+        # Build only the provided fields; conditions on the current row are
+        # expressed in SQL so no SELECT is needed before the UPDATE
+        values = {}
+        # Timestamp for resolved_at, taken at most once and only when a branch needs it
+        now = None
         
-        # Get issue and verify ownership
-        issue = IssueRepository.get_issue_by_id(db, issue_id, user_id, request_id)
-        if not issue:
-            return None
-        
-        # Update only provided fields
         if resolved is not None:
-            issue.issue_resolved = resolved
-            # If resolving, set resolved_at if not already set
-            if resolved and not issue.issue_resolved_at:
-                issue.issue_resolved_at = datetime.utcnow()
-            # If unresolving, clear resolved_at and resolved_by
-            elif not resolved:
-                issue.issue_resolved_at = None
-                issue.issue_resolved_by = None
+            values["issue_resolved"] = resolved
+            if resolved:
+                # If resolving, set resolved_at if not already set
+                now = now or datetime.now(timezone.utc)
+                values["issue_resolved_at"] = func.coalesce(Issue.issue_resolved_at, now)
+            else:
+                # If unresolving, clear resolved_at and resolved_by
+                values["issue_resolved_at"] = None
+                values["issue_resolved_by"] = None
         
         if description is not None:
-            issue.issue_description = description
+            values["issue_description"] = description
         
         if resolved_by is not None:
-            issue.issue_resolved_by = resolved_by
-            # If resolving and resolved_at not set, set it
-            if issue.issue_resolved and not issue.issue_resolved_at:
-                issue.issue_resolved_at = datetime.utcnow()
+            values["issue_resolved_by"] = resolved_by
+            # If the issue is (already) resolved and resolved_at not set, set it
+            if resolved is None:
+                now = now or datetime.now(timezone.utc)
+                values["issue_resolved_at"] = case(
+                    (Issue.issue_resolved == True, func.coalesce(Issue.issue_resolved_at, now)),
+                    else_=Issue.issue_resolved_at,
+                )
         
         if resolution_comment is not None:
-            issue.issue_resolution_comment = resolution_comment
+            values["issue_resolution_comment"] = resolution_comment
+        
+        if not values:
+            # Nothing to change, just return the issue (verifies ownership)
+            return IssueRepository.get_issue_by_id(db, issue_id, user_id, request_id)
+        
+        # Ownership is verified in the same statement via the job subquery
+        stmt = (
+            update(Issue)
+            .where(
+                Issue.issue_id == issue_id,
+                Issue.issues_job_id.in_(select(Job.job_id).where(Job.job_user_id == user_id)),
+            )
+            .values(**values)
+            .returning(Issue)
+        )
+        issue = db.execute(stmt).scalar_one_or_none()
+        
+        if not issue:
+            logger.warning(
+                "Issue not found or access denied",
+                extra={
+                    "request_id": request_id,
+                    "issue_id": issue_id,
+                    "user_id": user_id,
+                }
+            )
+            return None
         
         db.commit()
-        db.refresh(issue)
+        invalidate_user(user_id)
         
         logger.info(
             "Issue updated successfully",
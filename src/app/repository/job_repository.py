@@ -1,55 +1,105 @@
 """
 Repository for job data access operations.
 """
-from typing import List, Optional
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import bindparam, delete, desc, func, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 
-from src.models.job import Job
+from src.models.job import Job, JobStatus
 from src.schemas.job import JobResponse
+from src.app.repository.query_cache import cached_query, invalidate_user
 from src.app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Job statuses that allow cancelling/deleting a job
+_DELETABLE_STATUS_ORDER = (JobStatus.PENDING, JobStatus.NEEDS_REVIEW, JobStatus.FAILED)
+JOB_NOT_DELETABLE_MESSAGE = (
+    "Job can only be cancelled if status is PENDING, NEEDS_REVIEW, or FAILED. Current status: {}"
+)
+# Pre-built for log records
+_DELETABLE_STATUS_VALUES = [s.value for s in _DELETABLE_STATUS_ORDER]
+
+# Hot, parameter-stable statements built once; values are bound per call
+_COUNT_JOBS_STMT = select(func.count(Job.job_id))
+_COUNT_USER_JOBS_STMT = _COUNT_JOBS_STMT.where(Job.job_user_id == bindparam("user_id"))
+# Fetch only the id (no ORM row hydration); it's needed for the warning log
+_DUPLICATE_FILE_STMT = select(Job.job_id).where(
+    Job.job_user_id == bindparam("user_id"),
+    Job.job_original_filename == bindparam("filename")
+).limit(1)
+
+# Unique constraint that rejects a second upload of the same filename by a user
+_USER_FILENAME_CONSTRAINT = "uq_job_user_filename"
+
 
 class JobRepository:
     """Repository for job operations."""
     
     @staticmethod
-    def get_all_jobs(db: Session, user_id: Optional[str] = None, request_id: Optional[str] = None) -> List[Job]:
+    @cached_query("limit", "cursor", detach=True)
+    def get_all_jobs(
+        db: Session,
+        user_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> List[Job]:
         """
         Get all jobs, optionally filtered by user_id.
         
+        Supports keyset pagination: pass the (job_created_at, job_id) of the last
+        job of the previous page as `cursor` to get the jobs created before it.
+        
         Args:
             db: Database session
             user_id: Optional user ID to filter jobs
             request_id: Request ID for logging traceability
+            limit: Optional maximum number of jobs to return
+            cursor: Optional (job_created_at, job_id) of the last job already returned
             
         Returns:
-            List of Job objects
+            List of Job objects ordered by creation date (newest first)
         """
-        query = db.query(Job)
+        stmt = select(Job)
         
         if user_id:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Filtering jobs by user_id",
+                    extra={
+                        "request_id": request_id,
+                        "user_id": user_id,
+                    }
+                )
+            stmt = stmt.where(Job.job_user_id == user_id)
+        
+        if cursor is not None:
+            # Seek past the cursor's sort key (valid even if that job was deleted);
+            # job_id breaks ties between equal timestamps
+            cursor_created_at, cursor_job_id = cursor
+            stmt = stmt.where(
+                tuple_(Job.job_created_at, Job.job_id) < tuple_(cursor_created_at, cursor_job_id)
+            )
+        
+        stmt = stmt.order_by(desc(Job.job_created_at), desc(Job.job_id))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        jobs = db.execute(stmt).scalars().all()
+        
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                "Filtering jobs by user_id",
+                "Jobs query completed",
                 extra={
                     "request_id": request_id,
                     "user_id": user_id,
+                    "job_count": len(jobs),
                 }
             )
-            query = query.filter(Job.job_user_id == user_id)
-        
-        jobs = query.order_by(desc(Job.job_created_at)).all()
-        
-        logger.debug(
-            "Jobs query completed",
-            extra={
-                "request_id": request_id,
-                "user_id": user_id,
-                "job_count": len(jobs),
-            }
-        )
         
         return jobs
     
@@ -66,14 +116,16 @@ class JobRepository:
         Returns:
             Job object or None if not found
         """
-        query = db.query(Job).filter(Job.job_id == job_id)
+        # Session.get() checks the identity map first and only queries on a miss
+        job = db.get(Job, job_id)
         
-        if user_id:
-            query = query.filter(Job.job_user_id == user_id)
+        if job is not None and user_id and job.job_user_id != user_id:
+            return None
         
-        return query.first()
+        return job
     
     @staticmethod
+    @cached_query()
     def count_jobs(db: Session, user_id: Optional[str] = None) -> int:
         """
         Count total number of jobs, optionally filtered by user_id.
@@ -85,12 +137,10 @@ class JobRepository:
         Returns:
             Total count of jobs
         """
-        query = db.query(Job)
-        
         if user_id:
-            query = query.filter(Job.job_user_id == user_id)
+            return db.execute(_COUNT_USER_JOBS_STMT, {"user_id": user_id}).scalar_one()
         
-        return query.count()
+        return db.execute(_COUNT_JOBS_STMT).scalar_one()
     
     @staticmethod
     def create_job(
@@ -100,10 +150,14 @@ class JobRepository:
         s3_object_key: str,
         total_rows: int,
         request_id: Optional[str] = None
-    ) -> Job:
+    ) -> Optional[Job]:
         """
         Create a new job record.
         
+        A plain INSERT; when the uq_job_user_filename constraint is present in the
+        database (migrations/001_jobs_unique_user_filename.sql), a concurrent
+        duplicate upload is rejected by it and reported as None.
+        
         Args:
             db: Database session
             user_id: User ID from JWT token
@@ -113,23 +167,41 @@ class JobRepository:
             request_id: Request ID for logging traceability
             
         Returns:
-            Created Job object
+            Created Job object, or None if the user already imported a file with this name
         """
-        from src.models.job import JobStatus
-        
-        job = Job(
-            job_user_id=user_id,
-            job_original_filename=original_filename,
-            job_s3_object_key=s3_object_key,
-            job_status=JobStatus.PENDING,
-            job_total_rows=total_rows,
-            job_processed_rows=0,
-            job_issue_count=0,
+        stmt = (
+            insert(Job)
+            .values(
+                job_user_id=user_id,
+                job_original_filename=original_filename,
+                job_s3_object_key=s3_object_key,
+                job_status=JobStatus.PENDING,
+                job_total_rows=total_rows,
+                job_processed_rows=0,
+                job_issue_count=0,
+            )
+            .returning(Job)
         )
+        try:
+            job = db.execute(stmt).scalar_one()
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            # Only this constraint means "already imported"; any other violation is a real error
+            diag = getattr(e.orig, "diag", None)
+            if getattr(diag, "constraint_name", None) != _USER_FILENAME_CONSTRAINT:
+                raise
+            logger.warning(
+                "Duplicate file detected on insert",
+                extra={
+                    "request_id": request_id,
+                    "user_id": user_id,
+                    "file_name": original_filename,
+                }
+            )
+            return None
         
-        db.add(job)
-        db.commit()
-        db.refresh(job)
+        invalidate_user(user_id)
         
         logger.info(
             "Job created successfully",
@@ -163,19 +235,18 @@ class JobRepository:
         Returns:
             True if duplicate exists, False otherwise
         """
-        existing_job = db.query(Job).filter(
-            Job.job_user_id == user_id,
-            Job.job_original_filename == filename
-        ).first()
+        existing_job_id = db.execute(
+            _DUPLICATE_FILE_STMT, {"user_id": user_id, "filename": filename}
+        ).scalar()
         
-        if existing_job:
+        if existing_job_id is not None:
             logger.warning(
                 "Duplicate file detected",
                 extra={
                     "request_id": request_id,
                     "user_id": user_id,
                     "file_name": filename,
-                    "existing_job_id": existing_job.job_id,
+                    "existing_job_id": existing_job_id,
                 }
             )
             return True
@@ -199,9 +270,12 @@ class JobRepository:
         Returns:
             True if job was deleted, False if job not found
         """
-        job = db.query(Job).filter(Job.job_id == job_id).first()
+        # Single DELETE returning only the owner needed for logging/cache invalidation;
+        # related staging, issues and issue_items are removed by ON DELETE CASCADE
+        stmt = delete(Job).where(Job.job_id == job_id).returning(Job.job_user_id)
+        job_user_id = db.execute(stmt).scalar()
         
-        if not job:
+        if job_user_id is None:
             logger.warning(
                 "Job not found for deletion",
                 extra={
@@ -211,47 +285,128 @@ class JobRepository:
             )
             return False
         
-        db.delete(job)
         db.commit()
+        invalidate_user(job_user_id)
         
         logger.info(
             "Job deleted successfully",
             extra={
                 "request_id": request_id,
                 "job_id": job_id,
-                "user_id": job.job_user_id,
+                "user_id": job_user_id,
             }
         )
         
         return True
     
     @staticmethod
-    def can_delete_job(
+    def update_job_status(
+        db: Session,
+        job_id: int,
+        job_status: JobStatus,
+        request_id: Optional[str] = None
+    ) -> bool:
+        """
+        Set a job's status.
+        
+        Args:
+            db: Database session
+            job_id: Job ID to update
+            job_status: New status
+            request_id: Request ID for logging traceability
+            
+        Returns:
+            True if job was updated, False if job not found
+        """
+        stmt = (
+            update(Job)
+            .where(Job.job_id == job_id)
+            .values(job_status=job_status)
+            .returning(Job.job_user_id)
+        )
+        job_user_id = db.execute(stmt).scalar()
+        
+        if job_user_id is None:
+            logger.warning(
+                "Job not found for status update",
+                extra={
+                    "request_id": request_id,
+                    "job_id": job_id,
+                }
+            )
+            return False
+        
+        db.commit()
+        invalidate_user(job_user_id)
+        
+        logger.info(
+            "Job status updated",
+            extra={
+                "request_id": request_id,
+                "job_id": job_id,
+                "user_id": job_user_id,
+                "job_status": job_status.value,
+            }
+        )
+        
+        return True
+    
+    @staticmethod
+    def try_delete_job(
         db: Session,
         job_id: int,
         user_id: str,
         request_id: Optional[str] = None
-    ) -> tuple[bool, Optional[Job], Optional[str]]:
+    ) -> tuple[bool, Optional[JobStatus], Optional[str]]:
         """
-        Check if a job can be deleted (verifies ownership and status).
+        Atomically delete a job if it belongs to the user and its status allows deletion.
+        
+        Ownership, status check and delete run as one conditional DELETE, so the
+        status cannot change between the check and the delete.
         
         Args:
             db: Database session
-            job_id: Job ID to check
+            job_id: Job ID to delete
             user_id: User ID to verify ownership
             request_id: Request ID for logging traceability
             
         Returns:
-            Tuple of (can_delete: bool, job: Optional[Job], error_message: Optional[str])
-            - If can_delete is True, job is returned and error_message is None
-            - If can_delete is False, job may be None or the job object, and error_message explains why
+            Tuple of (deleted: bool, job_status: Optional[JobStatus], s3_key: Optional[str])
+            - If deleted is True, job_status is the status at deletion and s3_key the job's S3 object key
+            - If deleted is False and job_status is None, the job was not found or access denied
+            - If deleted is False and job_status is set, the job's status doesn't allow deletion
         """
-        from src.models.job import JobStatus
+        stmt = (
+            delete(Job)
+            .where(
+                Job.job_id == job_id,
+                Job.job_user_id == user_id,
+                Job.job_status.in_(_DELETABLE_STATUS_ORDER),
+            )
+            .returning(Job.job_status, Job.job_s3_object_key)
+        )
+        deleted = db.execute(stmt).first()
         
-        # Get job and verify ownership
-        job = JobRepository.get_job_by_id(db, job_id, user_id)
+        if deleted is not None:
+            db.commit()
+            invalidate_user(user_id)
+            
+            logger.info(
+                "Job deleted successfully",
+                extra={
+                    "request_id": request_id,
+                    "job_id": job_id,
+                    "user_id": user_id,
+                }
+            )
+            return (True, deleted.job_status, deleted.job_s3_object_key)
+        
+        # Nothing deleted: a lightweight probe tells "not found" from "wrong status"
+        job_status = db.execute(
+            select(Job.job_status).where(Job.job_id == job_id, Job.job_user_id == user_id)
+        ).scalar()
         
-        if not job:
+        if job_status is None:
             logger.warning(
                 "Job not found or access denied",
                 extra={
@@ -260,25 +415,16 @@ class JobRepository:
                     "user_id": user_id,
                 }
             )
-            return (False, None, "Job not found or you don't have access to it")
-        
-        # Check if job status allows deletion
-        allowed_statuses = [JobStatus.PENDING, JobStatus.NEEDS_REVIEW, JobStatus.FAILED]
-        if job.job_status not in allowed_statuses:
+        else:
             logger.warning(
                 "Job cannot be deleted: invalid status",
                 extra={
                     "request_id": request_id,
                     "job_id": job_id,
                     "user_id": user_id,
-                    "current_status": job.job_status.value,
-                    "allowed_statuses": [s.value for s in allowed_statuses],
+                    "current_status": job_status.value,
+                    "allowed_statuses": _DELETABLE_STATUS_VALUES,
                 }
             )
-            return (
-                False,
-                job,
-                f"Job can only be cancelled if status is PENDING, NEEDS_REVIEW, or FAILED. Current status: {job.job_status.value}"
-            )
         
-        return (True, job, None)
+        return (False, job_status, None)
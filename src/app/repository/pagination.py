@@ -0,0 +1,46 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor carries the (created_at, id) sort key of the last row of a page rather
+than just its id, so the next page can still be found after that row is deleted.
+"""
+import base64
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Build the cursor pointing just past a row.
+
+    Args:
+        created_at: Creation timestamp of the last row of the page
+        row_id: Primary key of the last row of the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Parse a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple of (created_at, row_id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError as e:
+        # Covers bad base64, non-UTF-8 bytes, a missing separator and bad field values
+        raise ValueError("Invalid pagination cursor") from e
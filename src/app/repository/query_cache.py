@@ -0,0 +1,91 @@
+"""
+Short-lived in-process cache for read-heavy repository queries.
+
+Dashboard/polling endpoints call the same list and count queries with
+identical parameters many times per minute. Results are cached per user for
+a few seconds; writes made through this API invalidate the user's entries,
+while changes made by other processes (e.g. the worker) become visible once
+the TTL expires.
+"""
+import inspect
+import threading
+from functools import wraps
+from typing import Callable, Optional
+
+from cachetools import TTLCache
+from sqlalchemy.orm import Session
+
+# Maximum staleness (per API worker process) for changes made outside this API
+QUERY_CACHE_TTL_SECONDS = 15
+QUERY_CACHE_MAX_SIZE = 4096
+
+_cache = TTLCache(maxsize=QUERY_CACHE_MAX_SIZE, ttl=QUERY_CACHE_TTL_SECONDS)
+_lock = threading.Lock()
+
+
+def cached_query(*key_params: str, detach: bool = False) -> Callable:
+    """
+    Decorator caching a repository method's result for QUERY_CACHE_TTL_SECONDS.
+
+    The cache key is (user_id, method name, *key_params values). The decorated
+    method must take a `db` session argument and may take a `user_id` argument.
+    Caching is skipped while the session has pending changes, so callers never
+    see a cached value that misses their own unflushed writes.
+
+    Args:
+        key_params: Names of additional arguments that identify the result
+        detach: Expunge returned ORM instances from the session before caching,
+            so they stay readable after the originating session commits or closes
+
+    Returns:
+        Decorator function
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        name = func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            db: Session = bound.arguments["db"]
+
+            if db.new or db.dirty or db.deleted:
+                return func(*args, **kwargs)
+
+            key = (bound.arguments.get("user_id"), name) + tuple(
+                bound.arguments[param] for param in key_params
+            )
+            with _lock:
+                try:
+                    return _cache[key]
+                except KeyError:
+                    pass
+
+            result = func(*args, **kwargs)
+            if detach:
+                for instance in result:
+                    db.expunge(instance)
+
+            with _lock:
+                _cache[key] = result
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_user(user_id: Optional[str]) -> None:
+    """
+    Drop cached query results for a user after a write.
+
+    Entries cached without a user_id (unfiltered queries) are dropped too,
+    since they include every user's data.
+
+    Args:
+        user_id: User ID whose cached results are stale
+    """
+    with _lock:
+        for key in [k for k in _cache.keys() if k[0] in (user_id, None)]:
+            _cache.pop(key, None)
@@ -1,10 +1,13 @@
 """
 Repository for staging data access operations.
 """
+import logging
 from typing import Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import select, update
 
-from src.models.issue import Staging
+from src.models.issue import Staging, StagingStatus
+from src.models.job import Job
 from src.app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -33,18 +36,16 @@ class StagingRepository:
         Returns:
             Staging object, or None if not found or access denied
         """
-        from src.models.job import Job
-        
         # Get staging with job join to verify ownership
-        staging = (
-            db.query(Staging)
+        stmt = (
+            select(Staging)
             .join(Job, Staging.staging_job_id == Job.job_id)
-            .filter(
+            .where(
                 Staging.staging_id == staging_id,
                 Job.job_user_id == user_id
             )
-            .first()
         )
+        staging = db.execute(stmt).scalar_one_or_none()
         
         if not staging:
             logger.warning(
@@ -57,14 +58,15 @@ class StagingRepository:
             )
             return None
         
-        logger.debug(
-            "Staging query completed",
-            extra={
-                "request_id": request_id,
-                "staging_id": staging_id,
-                "user_id": user_id,
-            }
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Staging query completed",
+                extra={
+                    "request_id": request_id,
+                    "staging_id": staging_id,
+                    "user_id": user_id,
+                }
+            )
         
         return staging
     
@@ -98,26 +100,47 @@ class StagingRepository:
         Returns:
             Updated Staging object, or None if not found or access denied
         """
-        # Get staging and verify ownership
-        staging = StagingRepository.get_staging_by_id(db, staging_id, user_id, request_id)
-        if not staging:
-            return None
-        
         # Update only provided fields
+        values = {}
         if email is not None:
-            staging.staging_email = email
+            values["staging_email"] = email
         if first_name is not None:
-            staging.staging_first_name = first_name
+            values["staging_first_name"] = first_name
         if last_name is not None:
-            staging.staging_last_name = last_name
+            values["staging_last_name"] = last_name
         if company is not None:
-            staging.staging_company = company
+            values["staging_company"] = company
         if status is not None:
-            from src.models.issue import StagingStatus
-            staging.staging_status = StagingStatus(status)
+            values["staging_status"] = StagingStatus(status)
+        
+        if not values:
+            # Nothing to change, just return the staging record (verifies ownership)
+            return StagingRepository.get_staging_by_id(db, staging_id, user_id, request_id)
+        
+        # Ownership is verified in the same statement via the job subquery
+        stmt = (
+            update(Staging)
+            .where(
+                Staging.staging_id == staging_id,
+                Staging.staging_job_id.in_(select(Job.job_id).where(Job.job_user_id == user_id)),
+            )
+            .values(**values)
+            .returning(Staging)
+        )
+        staging = db.execute(stmt).scalar_one_or_none()
+        
+        if not staging:
+            logger.warning(
+                "Staging not found or access denied",
+                extra={
+                    "request_id": request_id,
+                    "staging_id": staging_id,
+                    "user_id": user_id,
+                }
+            )
+            return None
         
         db.commit()
-        db.refresh(staging)
         
         logger.info(
             "Staging updated successfully",
@@ -0,0 +1,60 @@
+"""
+Shared boto3 session for AWS service clients.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+import boto3
+from botocore.config import Config
+
+# One session per process, so the credential provider chain
+# (env vars, ~/.aws/credentials, IAM role via IMDS) is resolved only once
+_session = boto3.session.Session()
+
+# Threads for blocking AWS calls made from async request handlers
+AWS_EXECUTOR_MAX_WORKERS = 16
+_executor = ThreadPoolExecutor(max_workers=AWS_EXECUTOR_MAX_WORKERS, thread_name_prefix="aws-io")
+
+
+def get_client(service_name: str, config: Config):
+    """
+    Create a boto3 client from the shared session.
+    
+    Args:
+        service_name: AWS service name (e.g. "s3", "sqs")
+        config: botocore client configuration (region, pool size, retries)
+        
+    Returns:
+        boto3 client for the service
+    """
+    return _session.client(service_name, config=config)
+
+
+def get_credentials():
+    """
+    Get the credentials resolved by the shared session.
+    
+    Returns:
+        botocore Credentials object, or None if no credentials were found
+    """
+    return _session.get_credentials()
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking AWS call in the shared AWS thread pool.
+    
+    Keeps the event loop free while boto3 waits on the network.
+    
+    Args:
+        func: Blocking callable
+        args: Positional arguments for func
+        kwargs: Keyword arguments for func
+        
+    Returns:
+        Return value of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
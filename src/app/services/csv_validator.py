@@ -1,10 +1,14 @@
 """
 CSV file validation service.
 """
+import asyncio
 import csv
 import io
 import hashlib
-from typing import Tuple, Optional, List, Dict
+import threading
+import zlib
+from typing import List, Optional, Tuple
+from cachetools import LRUCache
 from fastapi import UploadFile, HTTPException, status
 
 from src.app.logging_config import get_logger
@@ -14,6 +18,19 @@ logger = get_logger(__name__)
 # Maximum file size: 5MB
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
 
+# Slice size for the single hashing/counting pass over the upload
+SCAN_CHUNK_SIZE = 64 * 1024
+
+# Scan results of recent uploads, so client retries of the same file skip the hashing pass.
+# Keyed by a cheap fingerprint: (length, first 64 bytes, last 64 bytes, crc32)
+SCAN_CACHE_SIZE = 256
+_scan_cache = LRUCache(maxsize=SCAN_CACHE_SIZE)
+_scan_cache_lock = threading.Lock()
+
+# Byte order marks, checked before falling back to utf-8 / cp1252
+_UTF8_BOM = b'\xef\xbb\xbf'
+_UTF16_BOMS = (b'\xff\xfe', b'\xfe\xff')
+
 # Required CSV headers (case-insensitive, with variations)
 REQUIRED_HEADERS = {
     'email': ['email', 'e-mail', 'e_mail', 'email_address'],
@@ -22,6 +39,13 @@ REQUIRED_HEADERS = {
     'company': ['company', 'empresa', 'organization', 'org', 'company_name']
 }
 
+# Normalized (stripped, lowercase) header variation -> required header key
+_VARIATION_TO_KEY = {
+    variation.strip().lower(): key
+    for key, variations in REQUIRED_HEADERS.items()
+    for variation in variations
+}
+
 
 class CSVValidationError(Exception):
     """Custom exception for CSV validation errors."""
@@ -61,9 +85,77 @@ class CSVValidator:
         Raises:
             CSVValidationError: If file format is invalid
         """
-        if not filename.lower().endswith('.csv'):
+        # Lowercase only the 4-char suffix rather than the whole filename
+        if filename[-4:].lower() != '.csv':
             raise CSVValidationError("File must be a CSV file (.csv extension required)")
     
+    @staticmethod
+    def _scan_content_cached(file_content: bytes) -> Tuple[str, int, bool]:
+        """
+        Return the _scan_content result, reusing it for recently seen uploads.
+        
+        Args:
+            file_content: CSV file content as bytes
+            
+        Returns:
+            Tuple of (file hash hex digest, newline count, is simple CSV)
+        """
+        # crc32 runs far faster than the file hash and covers the whole body,
+        # so files that differ only in the middle don't share an entry
+        fingerprint = (
+            len(file_content),
+            file_content[:64],
+            file_content[-64:],
+            zlib.crc32(file_content),
+        )
+        with _scan_cache_lock:
+            cached = _scan_cache.get(fingerprint)
+        if cached is not None:
+            return cached
+        
+        result = CSVValidator._scan_content(file_content)
+        with _scan_cache_lock:
+            _scan_cache[fingerprint] = result
+        return result
+    
+    @staticmethod
+    def _scan_content(file_content: bytes) -> Tuple[str, int, bool]:
+        """
+        Hash the content, count its newlines and check whether it is a simple CSV, in a single pass.
+        
+        A simple CSV has no quotes (so no quoted newlines), no NUL bytes
+        (rejected by the csv module) and no bare carriage returns (treated as
+        line breaks by the csv module), so its newline count matches the
+        csv.reader row count.
+        
+        Args:
+            file_content: CSV file content as bytes
+            
+        Returns:
+            Tuple of (file hash hex digest, newline count, is simple CSV)
+        """
+        # BLAKE2b (stdlib) is faster than sha256 in software; the hash only
+        # identifies duplicate uploads and isn't persisted
+        hasher = hashlib.blake2b(digest_size=32)
+        newlines = 0
+        simple = True
+        view = memoryview(file_content)
+        
+        # Slices are zero-copy; each chunk is hashed and scanned while still in cache
+        for start in range(0, len(view), SCAN_CHUNK_SIZE):
+            end = start + SCAN_CHUNK_SIZE
+            hasher.update(view[start:end])
+            newlines += file_content.count(b'\n', start, end)
+            if simple:
+                # A CRLF pair may straddle the chunk boundary, hence end + 1
+                simple = (
+                    file_content.find(b'"', start, end) == -1
+                    and file_content.find(b'\x00', start, end) == -1
+                    and file_content.count(b'\r', start, end) == file_content.count(b'\r\n', start, end + 1)
+                )
+        
+        return hasher.hexdigest(), newlines, simple
+    
     @staticmethod
     def validate_csv_content(file_content: bytes) -> Tuple[int, str]:
         """
@@ -79,41 +171,42 @@ class CSVValidator:
             CSVValidationError: If CSV is invalid or empty
         """
         try:
-            # Decode file content
-            try:
-                content_str = file_content.decode('utf-8')
-            except UnicodeDecodeError:
-                # Try other common encodings
-                try:
-                    content_str = file_content.decode('latin-1')
-                except UnicodeDecodeError:
-                    raise CSVValidationError("File encoding is not supported. Please use UTF-8 or Latin-1.")
+            # Generate file hash for duplicate detection (rows scanned in the same pass)
+            file_hash, newlines, simple = CSVValidator._scan_content_cached(file_content)
             
-            # Check if file is empty
-            if not content_str.strip():
-                raise CSVValidationError("CSV file is empty")
-            
-            # Parse CSV
-            csv_reader = csv.reader(io.StringIO(content_str))
-            rows = list(csv_reader)
+            if simple:
+                # Fast path: without quotes every newline ends a record, so count
+                # them directly on the bytes (no decode, no per-cell parsing)
+                if not file_content.strip():
+                    raise CSVValidationError("CSV file is empty")
+                
+                total_rows = newlines + (0 if file_content.endswith(b'\n') else 1)
+            else:
+                # Decode file content (same encoding detection as header validation)
+                content_str, _ = CSVValidator._decode_content(file_content)
+                
+                # Check if file is empty
+                if not content_str.strip():
+                    raise CSVValidationError("CSV file is empty")
+                
+                # Parse CSV, counting rows without keeping them in memory
+                csv_reader = csv.reader(io.StringIO(content_str))
+                total_rows = sum(1 for _ in csv_reader)
             
             # Check if CSV has at least a header row
-            if len(rows) == 0:
+            if total_rows == 0:
                 raise CSVValidationError("CSV file has no rows")
             
             # Count data rows (excluding header)
-            data_rows = len(rows) - 1
+            data_rows = total_rows - 1
             
             if data_rows == 0:
                 raise CSVValidationError("CSV file has no data rows (only header)")
             
-            # Generate file hash for duplicate detection
-            file_hash = hashlib.sha256(file_content).hexdigest()
-            
             logger.debug(
                 "CSV content validated",
                 extra={
-                    "total_rows": len(rows),
+                    "total_rows": total_rows,
                     "data_rows": data_rows,
                     "file_hash": file_hash[:16] + "...",  # Log only first 16 chars
                 }
@@ -129,46 +222,79 @@ class CSVValidator:
             raise CSVValidationError(f"Error reading CSV file: {str(e)}")
     
     @staticmethod
-    def _normalize_header(header: str) -> str:
+    def _decode_content(file_content: bytes) -> Tuple[str, str]:
         """
-        Normalize header name for comparison (lowercase, strip whitespace).
+        Decode CSV content with a single decode pass.
+        
+        A byte order mark selects the encoding directly. Otherwise UTF-8 is
+        tried, falling back to cp1252 (which also covers latin-1 /
+        iso-8859-1 text); cp1252 decoding never fails, since undefined
+        bytes are replaced. Content that doesn't decode under its BOM's
+        encoding (e.g. odd-length or truncated UTF-16) takes the same fallback.
         
         Args:
-            header: Header name to normalize
+            file_content: CSV file content as bytes
             
         Returns:
-            Normalized header name
+            Tuple of (decoded content, encoding used)
         """
-        return header.strip().lower() if header else ""
+        if file_content.startswith(_UTF8_BOM):
+            encoding = 'utf-8-sig'
+        elif file_content[:2] in _UTF16_BOMS:
+            encoding = 'utf-16'
+        else:
+            encoding = 'utf-8'
+        
+        try:
+            return file_content.decode(encoding), encoding
+        except UnicodeDecodeError:
+            return file_content.decode('cp1252', errors='replace'), 'cp1252'
     
     @staticmethod
-    def _find_required_header(header_name: str, csv_headers: List[str]) -> Optional[str]:
+    def _parse_header_fields(content_io: io.StringIO, delimiter: str) -> Optional[List[str]]:
         """
-        Find a required header in CSV headers, checking for variations.
+        Parse the header row with a delimiter and check that the result looks valid.
         
         Args:
-            header_name: Required header name (key from REQUIRED_HEADERS)
-            csv_headers: List of CSV header names
+            content_io: Decoded header content; rewound before parsing so one buffer serves every attempt
+            delimiter: Delimiter to split the header row with
             
         Returns:
-            Found header name from CSV, or None if not found
+            Cleaned header names, or None if the delimiter doesn't fit the header row
         """
-        variations = REQUIRED_HEADERS.get(header_name, [])
-        normalized_csv_headers = {CSVValidator._normalize_header(h): h for h in csv_headers}
+        content_io.seek(0)
+        # Only the first row is needed, so a plain reader suffices (no DictReader mapping)
+        fieldnames = next(csv.reader(content_io, delimiter=delimiter), None)
         
-        # Check each variation
-        for variation in variations:
-            normalized_variation = CSVValidator._normalize_header(variation)
-            if normalized_variation in normalized_csv_headers:
-                return normalized_csv_headers[normalized_variation]
+        # Get fieldnames
+        if not fieldnames:
+            return None
         
-        return None
+        # Clean headers (strip whitespace, remove empty)
+        cleaned_headers = [
+            h.strip() for h in fieldnames
+            if h and h.strip()
+        ]
+        
+        # Check if we got meaningful headers
+        if len(cleaned_headers) <= 1:
+            return None
+        
+        # Verify field names look reasonable (same logic as worker)
+        if delimiter == ';':
+            field_names_look_valid = not any(',' in fn for fn in cleaned_headers)
+        elif delimiter == ',':
+            field_names_look_valid = not any(';' in fn for fn in cleaned_headers)
+        else:
+            field_names_look_valid = not any(',' in fn or ';' in fn for fn in cleaned_headers)
+        
+        return cleaned_headers if field_names_look_valid else None
     
     @staticmethod
     def validate_csv_headers(file_content: bytes) -> None:
         """
         Validate that CSV file contains required headers.
-        Tries multiple encodings and delimiters (same logic as worker's read_csv_file).
+        Detects the encoding once and tries multiple delimiters (same logic as worker's read_csv_file).
         
         Args:
             file_content: CSV file content as bytes
@@ -176,73 +302,33 @@ class CSVValidator:
         Raises:
             CSVValidationError: If required headers are missing
         """
-        # Try multiple encodings in order of preference (same as worker)
-        encodings = ["utf-8", "latin-1", "cp1252", "iso-8859-1", "windows-1252"]
-        content = None
-        used_encoding = None
-        
-        for encoding in encodings:
-            try:
-                content = file_content.decode(encoding)
-                used_encoding = encoding
-                logger.debug(
-                    "CSV decoded successfully with encoding for header validation",
-                    extra={"encoding": encoding}
-                )
-                break
-            except UnicodeDecodeError:
-                logger.debug(
-                    "Failed to decode CSV with encoding, trying next",
-                    extra={"encoding": encoding}
-                )
-                continue
+        # Only the header line is needed, so decode and parse just that slice.
+        # UTF-16 newlines are two bytes wide, so those files are decoded whole.
+        if file_content[:2] in _UTF16_BOMS:
+            header_bytes = file_content
+        else:
+            newline = file_content.find(b'\n')
+            header_bytes = file_content[:newline] if newline != -1 else file_content
         
-        if content is None:
-            raise CSVValidationError(
-                f"Failed to decode CSV file with any encoding. "
-                f"Tried: {', '.join(encodings)}"
-            )
+        content, used_encoding = CSVValidator._decode_content(header_bytes)
+        logger.debug(
+            "CSV decoded successfully with encoding for header validation",
+            extra={"encoding": used_encoding}
+        )
         
         # Try different delimiters (same as worker: semicolon first for European format)
         delimiters = [';', ',', '\t']
         headers = None
         used_delimiter = None
         
+        content_io = io.StringIO(content)
+        
         for delimiter in delimiters:
             try:
-                content_io = io.StringIO(content)
-                csv_reader = csv.DictReader(content_io, delimiter=delimiter)
-                
-                # Get fieldnames
-                if csv_reader.fieldnames:
-                    # Clean headers (strip whitespace, remove empty)
-                    cleaned_headers = [
-                        h.strip() for h in csv_reader.fieldnames 
-                        if h and h.strip()
-                    ]
-                    
-                    # Check if we got meaningful headers
-                    if cleaned_headers and len(cleaned_headers) > 1:
-                        # Verify field names look reasonable (same logic as worker)
-                        if delimiter == ';':
-                            field_names_look_valid = not any(',' in str(fn) for fn in cleaned_headers if fn)
-                        elif delimiter == ',':
-                            field_names_look_valid = not any(';' in str(fn) for fn in cleaned_headers if fn)
-                        else:
-                            field_names_look_valid = not any(',' in str(fn) or ';' in str(fn) for fn in cleaned_headers if fn)
-                        
-                        if field_names_look_valid:
-                            headers = cleaned_headers
-                            used_delimiter = delimiter
-                            logger.debug(
-                                "CSV headers detected successfully",
-                                extra={
-                                    "delimiter": repr(delimiter),
-                                    "headers": headers,
-                                    "encoding": used_encoding
-                                }
-                            )
-                            break
+                headers = CSVValidator._parse_header_fields(content_io, delimiter)
+                if headers:
+                    used_delimiter = delimiter
+                    break
             except Exception as e:
                 logger.debug(
                     "Failed to parse CSV headers with delimiter, trying next",
@@ -253,15 +339,26 @@ class CSVValidator:
                 )
                 continue
         
+        if headers is not None:
+            logger.debug(
+                "CSV headers detected successfully",
+                extra={
+                    "delimiter": repr(used_delimiter),
+                    "headers": headers,
+                    "encoding": used_encoding
+                }
+            )
+        
         # If no delimiter worked, try default (comma)
         if headers is None:
             logger.debug(
                 "Could not parse CSV headers with common delimiters, using default comma",
                 extra={"delimiters_tried": [repr(d) for d in delimiters]}
             )
-            csv_reader = csv.DictReader(io.StringIO(content))
-            if csv_reader.fieldnames:
-                headers = [h.strip() for h in csv_reader.fieldnames if h and h.strip()]
+            content_io.seek(0)
+            fieldnames = next(csv.reader(content_io), None)
+            if fieldnames:
+                headers = [h.strip() for h in fieldnames if h and h.strip()]
                 used_delimiter = ','
         
         if not headers:
@@ -270,15 +367,17 @@ class CSVValidator:
             )
         
         # Validate required headers
-        missing_headers = []
         found_headers = {}
         
-        for required_key, variations in REQUIRED_HEADERS.items():
-            found_header = CSVValidator._find_required_header(required_key, headers)
-            if found_header:
-                found_headers[required_key] = found_header
-            else:
-                missing_headers.append(required_key)
+        for header in headers:
+            required_key = _VARIATION_TO_KEY.get(header.lower())
+            if required_key and required_key not in found_headers:
+                found_headers[required_key] = header
+                if len(found_headers) == len(REQUIRED_HEADERS):
+                    # Every required header is present; remaining columns can't change the result
+                    break
+        
+        missing_headers = [key for key in REQUIRED_HEADERS if key not in found_headers]
         
         if missing_headers:
             # Create user-friendly error message
@@ -340,18 +439,26 @@ class CSVValidator:
             # Validate filename
             CSVValidator.validate_file_format(file.filename)
             
-            # Read file content
-            file_content = await file.read()
+            # Reject oversize uploads before reading them when the size is known
+            if file.size is not None:
+                CSVValidator.validate_file_size(file.size)
+            
+            # Read file content, never more than one byte past the limit
+            file_content = await file.read(MAX_FILE_SIZE + 1)
             
             # Validate file size
             CSVValidator.validate_file_size(len(file_content))
             
             # Validate CSV headers (BEFORE validating content)
-            # This uses the same encoding/delimiter logic as the worker
-            CSVValidator.validate_csv_headers(file_content)
+            # This uses the same encoding/delimiter logic as the worker.
+            # Parsing and hashing are CPU-bound, so they run in a worker thread
+            # to keep the event loop free for other requests.
+            await asyncio.to_thread(CSVValidator.validate_csv_headers, file_content)
             
             # Validate CSV content
-            row_count, file_hash = CSVValidator.validate_csv_content(file_content)
+            row_count, file_hash = await asyncio.to_thread(
+                CSVValidator.validate_csv_content, file_content
+            )
             
             logger.info(
                 "CSV file validation passed",
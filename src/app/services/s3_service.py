@@ -1,17 +1,51 @@
 """
 S3 service for uploading CSV files.
 """
-import boto3
+import io
+from functools import lru_cache
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
-from typing import BinaryIO
-import uuid
-from datetime import datetime
+from typing import BinaryIO, Optional
+import os
+import threading
+import time
 
 from src.settings import settings
-from src.app.logging_config import get_logger
+from src.app.services.aws_session import get_client, run_blocking
+from src.app.logging_config import get_logger, sampled_exc_info
 
 logger = get_logger(__name__)
 
+# Bodies of at least 8MB use a multipart managed transfer (parts sent in parallel,
+# retried individually); smaller ones are sent with a single put_object
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
+# Characters replaced in user-supplied filenames before they go into an S3 key
+_SAFE_FILENAME_TABLE = str.maketrans({" ": "_", "/": "_", "\\": "_", "\x00": "_"})
+
+# Optional zstd compression of uploaded CSVs (S3_COMPRESS_UPLOADS); objects are
+# stored with ContentEncoding=zstd and the worker must decompress them
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bodies up to this size are stored uncompressed
+COMPRESSION_MIN_SIZE = 64 * 1024
+ZSTD_LEVEL = 3
+
+_zstd_local = threading.local()
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    """Compress data with zstd; compressors aren't thread-safe, so each thread keeps its own."""
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor.compress(data)
+
 
 class S3Service:
     """Service for S3 operations."""
@@ -20,13 +54,51 @@ class S3Service:
         """Initialize S3 client."""
         self.bucket_name = settings.CSV_BUCKET_NAME
         self.region = settings.AWS_REGION
-        self.s3_client = boto3.client('s3', region_name=self.region)
+        # Larger pool for concurrent requests (and multipart threads),
+        # adaptive retries to back off on S3 throttling (503 SlowDown)
+        client_config = Config(
+            region_name=self.region,
+            max_pool_connections=50,
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            tcp_keepalive=True,
+            s3={'addressing_style': 'virtual'},
+        )
+        self.s3_client = get_client('s3', client_config)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=MULTIPART_THRESHOLD,
+            multipart_chunksize=MULTIPART_THRESHOLD,
+            max_concurrency=10,
+            use_threads=True,
+        )
+        self.compress_uploads = settings.S3_COMPRESS_UPLOADS and zstandard is not None
+        if settings.S3_COMPRESS_UPLOADS and zstandard is None:
+            logger.warning(
+                "S3_COMPRESS_UPLOADS is enabled but zstandard is not installed; uploads are stored uncompressed"
+            )
+    
+    @staticmethod
+    def build_object_key(original_filename: str, user_id: str) -> str:
+        """
+        Generate a unique S3 object key for an uploaded CSV file.
+        
+        Args:
+            original_filename: Original filename from user
+            user_id: User ID for organizing files
+            
+        Returns:
+            S3 object key: uploads/{user_id}/{timestamp_ns}-{random_hex}-{filename}
+        """
+        timestamp = time.time_ns()
+        unique_id = os.urandom(4).hex()
+        safe_filename = original_filename.translate(_SAFE_FILENAME_TABLE)
+        return f"uploads/{user_id}/{timestamp}-{unique_id}-{safe_filename}"
     
     def upload_csv_file(
         self,
         file_content: bytes,
         original_filename: str,
-        user_id: str
+        user_id: str,
+        s3_key: Optional[str] = None
     ) -> str:
         """
         Upload CSV file to S3 bucket.
@@ -35,6 +107,7 @@ class S3Service:
             file_content: File content as bytes
             original_filename: Original filename from user
             user_id: User ID for organizing files
+            s3_key: Optional pre-generated object key (see build_object_key)
             
         Returns:
             S3 object key (path in bucket)
@@ -45,38 +118,57 @@ class S3Service:
         if not self.bucket_name:
             raise ValueError("CSV_BUCKET_NAME is not configured")
         
-        # Generate unique S3 key: uploads/{user_id}/{timestamp}-{uuid}-{filename}
-        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
-        safe_filename = original_filename.replace(" ", "_").replace("/", "_")
-        s3_key = f"uploads/{user_id}/{timestamp}-{unique_id}-{safe_filename}"
+        if s3_key is None:
+            s3_key = self.build_object_key(original_filename, user_id)
+        
+        # Fields shared by every log line of this upload; logging copies extra, so reuse is safe
+        log_ctx = {
+            "bucket": self.bucket_name,
+            "s3_key": s3_key,
+        }
         
         try:
+            extra_args = {
+                'ContentType': 'text/csv',
+                'ServerSideEncryption': 'AES256',
+            }
+            body = file_content
+            if self.compress_uploads and len(file_content) > COMPRESSION_MIN_SIZE:
+                body = _zstd_compress(file_content)
+                extra_args['ContentEncoding'] = 'zstd'
+            
             logger.info(
                 "Uploading file to S3",
                 extra={
-                    "bucket": self.bucket_name,
-                    "s3_key": s3_key,
+                    **log_ctx,
                     "file_name": original_filename,
                     "file_size": len(file_content),
+                    "upload_size": len(body),
                 }
             )
             
-            # Upload file to S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=file_content,
-                ContentType='text/csv',
-                ServerSideEncryption='AES256',
-            )
+            # Upload file to S3. Uploads are capped well below the multipart threshold,
+            # so they normally go out as one direct PUT; the managed transfer (and its
+            # thread setup) is only used for bodies large enough to be split into parts.
+            if len(body) < MULTIPART_THRESHOLD:
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=body,
+                    **extra_args,
+                )
+            else:
+                self.s3_client.upload_fileobj(
+                    Fileobj=io.BytesIO(body),
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    ExtraArgs=extra_args,
+                    Config=self.transfer_config,
+                )
             
             logger.info(
                 "File uploaded successfully",
-                extra={
-                    "bucket": self.bucket_name,
-                    "s3_key": s3_key,
-                }
+                extra=log_ctx
             )
             
             return s3_key
@@ -86,23 +178,34 @@ class S3Service:
             logger.error(
                 "S3 upload failed",
                 extra={
-                    "bucket": self.bucket_name,
-                    "s3_key": s3_key,
+                    **log_ctx,
                     "error_code": error_code,
                     "error": str(e),
                 },
-                exc_info=True
+                exc_info=sampled_exc_info("S3 upload failed")
             )
             raise Exception(f"Failed to upload file to S3: {error_code}")
         
+        except S3UploadFailedError as e:
+            # Managed transfers wrap the underlying ClientError
+            logger.error(
+                "S3 upload failed",
+                extra={
+                    **log_ctx,
+                    "error": str(e),
+                },
+                exc_info=sampled_exc_info("S3 upload failed")
+            )
+            raise Exception(f"Failed to upload file to S3: {str(e)}")
+        
         except BotoCoreError as e:
             logger.error(
                 "S3 client error",
                 extra={
-                    "bucket": self.bucket_name,
+                    **log_ctx,
                     "error": str(e),
                 },
-                exc_info=True
+                exc_info=sampled_exc_info("S3 client error")
             )
             raise Exception(f"S3 service error: {str(e)}")
         
@@ -110,14 +213,45 @@ class S3Service:
             logger.error(
                 "Unexpected error during S3 upload",
                 extra={
-                    "bucket": self.bucket_name,
-                    "s3_key": s3_key,
+                    **log_ctx,
                     "error": str(e),
                 },
                 exc_info=True
             )
             raise
     
+    async def upload_csv_file_async(
+        self,
+        file_content: bytes,
+        original_filename: str,
+        user_id: str,
+        s3_key: Optional[str] = None
+    ) -> str:
+        """
+        Upload CSV file to S3 bucket without blocking the event loop.
+        
+        Runs upload_csv_file in the shared AWS thread pool.
+        
+        Args:
+            file_content: File content as bytes
+            original_filename: Original filename from user
+            user_id: User ID for organizing files
+            s3_key: Optional pre-generated object key (see build_object_key)
+            
+        Returns:
+            S3 object key (path in bucket)
+            
+        Raises:
+            Exception: If upload fails
+        """
+        return await run_blocking(
+            self.upload_csv_file,
+            file_content=file_content,
+            original_filename=original_filename,
+            user_id=user_id,
+            s3_key=s3_key,
+        )
+    
     def delete_file(self, s3_key: str) -> None:
         """
         Delete a file from S3 bucket.
@@ -163,7 +297,7 @@ class S3Service:
                     "error_code": error_code,
                     "error": str(e),
                 },
-                exc_info=True
+                exc_info=sampled_exc_info("S3 delete failed")
             )
             raise Exception(f"Failed to delete file from S3: {error_code}")
         
@@ -175,7 +309,7 @@ class S3Service:
                     "s3_key": s3_key,
                     "error": str(e),
                 },
-                exc_info=True
+                exc_info=sampled_exc_info("S3 client error during delete")
             )
             raise Exception(f"S3 service error during delete: {str(e)}")
         
@@ -191,6 +325,31 @@ class S3Service:
             )
             raise
 
+    
+    async def delete_file_async(self, s3_key: str) -> None:
+        """
+        Delete a file from S3 bucket without blocking the event loop.
+        
+        Runs delete_file in the shared AWS thread pool.
+        
+        Args:
+            s3_key: S3 object key to delete
+            
+        Raises:
+            Exception: If deletion fails
+        """
+        await run_blocking(self.delete_file, s3_key)
 
-# Singleton instance
-s3_service = S3Service()
+
+
+@lru_cache(maxsize=1)
+def get_s3_service() -> S3Service:
+    """
+    Get the shared S3Service, creating its client on first use rather than at import.
+    
+    Used as a FastAPI dependency, so tests can swap it via app.dependency_overrides.
+    
+    Returns:
+        S3Service instance
+    """
+    return S3Service()
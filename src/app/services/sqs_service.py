@@ -2,14 +2,32 @@
 SQS service for publishing job messages.
 """
 import json
-import boto3
+import logging
+import re
+from functools import lru_cache
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
 
 from src.settings import settings
-from src.app.logging_config import get_logger
+from src.app.services.aws_session import get_client, get_credentials, run_blocking
+from src.app.logging_config import get_logger, sampled_exc_info
 
 logger = get_logger(__name__)
 
+# Region part of a queue URL: https://sqs.{region}.amazonaws.com/{account_id}/{queue_name}
+_SQS_URL_RE = re.compile(r'https://sqs\.([^.]+)\.amazonaws\.com')
+
+# Message body serializer: orjson (C extension) when installed, stdlib json otherwise
+try:
+    import orjson
+    
+    def _dumps(payload: dict) -> str:
+        """Serialize a message body; orjson returns UTF-8 bytes, SQS needs str."""
+        return orjson.dumps(payload).decode()
+except ImportError:
+    # Bound once; compact separators match orjson output and trim billable message size
+    _dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
 
 class SQSService:
     """Service for SQS operations."""
@@ -21,37 +39,24 @@ class SQSService:
         # Extract region from queue URL if available, otherwise use AWS_REGION setting
         # Queue URL format: https://sqs.{region}.amazonaws.com/{account_id}/{queue_name}
         if self.queue_url:
-            try:
-                # Extract region from queue URL using regex
-                # Example: https://sqs.eu-central-1.amazonaws.com/123456789012/queue-name
-                import re
-                match = re.search(r'https://sqs\.([^.]+)\.amazonaws\.com', self.queue_url)
-                if match:
-                    self.region = match.group(1)  # eu-central-1
-                    logger.debug(
-                        "Extracted region from SQS queue URL",
-                        extra={
-                            "queue_url": self.queue_url,
-                            "extracted_region": self.region,
-                        }
-                    )
-                else:
-                    self.region = settings.AWS_REGION
-                    logger.warning(
-                        "Could not extract region from SQS queue URL, using AWS_REGION setting",
-                        extra={
-                            "queue_url": self.queue_url,
-                            "fallback_region": self.region,
-                        }
-                    )
-            except Exception as e:
+            # Example: https://sqs.eu-central-1.amazonaws.com/123456789012/queue-name
+            match = _SQS_URL_RE.match(self.queue_url)
+            if match:
+                self.region = match.group(1)  # eu-central-1
+                logger.debug(
+                    "Extracted region from SQS queue URL",
+                    extra={
+                        "queue_url": self.queue_url,
+                        "extracted_region": self.region,
+                    }
+                )
+            else:
                 self.region = settings.AWS_REGION
                 logger.warning(
-                    "Error extracting region from SQS queue URL, using AWS_REGION setting",
+                    "Could not extract region from SQS queue URL, using AWS_REGION setting",
                     extra={
                         "queue_url": self.queue_url,
                         "fallback_region": self.region,
-                        "error": str(e),
                     }
                 )
         else:
@@ -63,12 +68,25 @@ class SQSService:
         # 2. ~/.aws/credentials file
         # 3. IAM role (when running on EC2/ECS)
         try:
-            self.sqs_client = boto3.client('sqs', region_name=self.region)
+            # Larger pool for concurrent requests, adaptive retries on throttling
+            client_config = Config(
+                region_name=self.region,
+                max_pool_connections=50,
+                retries={'max_attempts': 10, 'mode': 'adaptive'},
+                tcp_keepalive=True,
+            )
+            self.sqs_client = get_client('sqs', client_config)
             
-            # Log AWS credentials status (without exposing secrets)
-            session = boto3.Session()
-            credentials = session.get_credentials()
-            if credentials:
+            # Log AWS credentials status (without exposing secrets). Creating the
+            # client already resolved the credential chain and the session caches
+            # the result, so this lookup is cheap; only the key preview is debug-only.
+            credentials = get_credentials()
+            if credentials is None:
+                logger.warning(
+                    "No AWS credentials found. boto3 will try to use IAM role or default profile.",
+                    extra={"region": self.region}
+                )
+            elif logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
                     "AWS credentials found",
                     extra={
@@ -76,11 +94,6 @@ class SQSService:
                         "region": self.region,
                     }
                 )
-            else:
-                logger.warning(
-                    "No AWS credentials found. boto3 will try to use IAM role or default profile.",
-                    extra={"region": self.region}
-                )
         except Exception as e:
             logger.error(
                 "Failed to initialize SQS client",
@@ -127,7 +140,7 @@ class SQSService:
             
             response = self.sqs_client.send_message(
                 QueueUrl=self.queue_url,
-                MessageBody=json.dumps(message_body),
+                MessageBody=_dumps(message_body),
             )
             
             message_id = response.get('MessageId')
@@ -158,7 +171,7 @@ class SQSService:
                         "region": self.region,
                         "note": "This error can occur if: 1) Queue doesn't exist, OR 2) No access policy/permissions configured",
                     },
-                    exc_info=True
+                    exc_info=sampled_exc_info("SQS queue access failed")
                 )
                 raise Exception(
                     f"SQS queue access failed: {self.queue_url}. "
@@ -175,7 +188,7 @@ class SQSService:
                     "error_code": error_code,
                     "error": str(e),
                 },
-                exc_info=True
+                exc_info=sampled_exc_info("SQS publish failed")
             )
             raise Exception(f"Failed to publish message to SQS: {error_code}")
         
@@ -186,7 +199,7 @@ class SQSService:
                     "queue_url": self.queue_url,
                     "error": str(e),
                 },
-                exc_info=True
+                exc_info=sampled_exc_info("SQS client error")
             )
             raise Exception(f"SQS service error: {str(e)}")
         
@@ -202,6 +215,31 @@ class SQSService:
             )
             raise
 
+    
+    async def publish_job_message_async(self, job_id: int, s3_key: str) -> None:
+        """
+        Publish a job processing message to SQS queue without blocking the event loop.
+        
+        Runs publish_job_message in the shared AWS thread pool.
+        
+        Args:
+            job_id: Job ID
+            s3_key: S3 object key for the CSV file
+            
+        Raises:
+            Exception: If message publishing fails
+        """
+        await run_blocking(self.publish_job_message, job_id, s3_key)
+
 
-# Singleton instance
-sqs_service = SQSService()
+@lru_cache(maxsize=1)
+def get_sqs_service() -> SQSService:
+    """
+    Get the shared SQSService, creating its client on first use rather than at import.
+    
+    Used as a FastAPI dependency, so tests can swap it via app.dependency_overrides.
+    
+    Returns:
+        SQSService instance
+    """
+    return SQSService()
@@ -1,7 +1,8 @@
 """
 SQLAlchemy models for issues, issue_items, and staging tables.
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum, ForeignKey, BigInteger
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, BigInteger, Index
+from sqlalchemy.dialects.postgresql import ENUM as PGEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -25,14 +26,24 @@ class StagingStatus(str, enum.Enum):
     ISSUE = "ISSUE"
 
 
+# Native Postgres enum types; they already exist in the database, so no CREATE TYPE is emitted
+_ISSUE_TYPE = PGEnum(IssueType, name="issuetype", create_type=False)
+_STAGING_STATUS = PGEnum(StagingStatus, name="stagingstatus", create_type=False)
+
+
 class Issue(Base):
     """Issue model representing the issues table."""
     
     __tablename__ = "issues"
+    # Composite indexes below are created by migrations/003_composite_issue_staging_indexes.sql
+    __table_args__ = (
+        # Unresolved/resolved issues of a job
+        Index("ix_issues_job_resolved", "issues_job_id", "issue_resolved"),
+    )
     
     issue_id = Column(Integer, primary_key=True, index=True)
     issues_job_id = Column(Integer, ForeignKey("jobs.job_id", ondelete="CASCADE"), nullable=False, index=True)
-    issue_type = Column(SQLEnum(IssueType), nullable=False, index=True)
+    issue_type = Column(_ISSUE_TYPE, nullable=False, index=True)
     issue_key = Column(String, nullable=False)
     issue_resolved = Column(Boolean, nullable=False, default=False, index=True)
     issue_description = Column(String, nullable=True)
@@ -52,6 +63,10 @@ class IssueItem(Base):
     """IssueItem model representing the issue_items table."""
     
     __tablename__ = "issue_items"
+    __table_args__ = (
+        # Issue -> staging rows join is answered from the index alone
+        Index("ix_issue_items_issue_staging", "item_issue_id", "item_staging_id"),
+    )
     
     issue_item_id = Column(Integer, primary_key=True, index=True)
     item_issue_id = Column(Integer, ForeignKey("issues.issue_id", ondelete="CASCADE"), nullable=False, index=True)
@@ -69,6 +84,13 @@ class Staging(Base):
     """Staging model representing the staging table."""
     
     __tablename__ = "staging"
+    __table_args__ = (
+        # Staging rows of a job filtered by status
+        Index("ix_staging_job_status", "staging_job_id", "staging_status"),
+        # Row hash lookups within a job. Not unique: duplicate rows of a CSV are staged
+        # (and reported as DUPLICATE_EMAIL). Created by migrations/002_staging_job_row_hash_index.sql
+        Index("ix_staging_job_hash", "staging_job_id", "staging_row_hash"),
+    )
     
     staging_id = Column(BigInteger, primary_key=True, index=True)
     staging_job_id = Column(Integer, ForeignKey("jobs.job_id", ondelete="CASCADE"), nullable=False, index=True)
@@ -77,7 +99,7 @@ class Staging(Base):
     staging_last_name = Column(String, nullable=True)
     staging_company = Column(String, nullable=True)
     staging_created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    staging_status = Column(SQLEnum(StagingStatus), nullable=True, index=True)
+    staging_status = Column(_STAGING_STATUS, nullable=True, index=True)
     staging_row_hash = Column(String, nullable=False)  # Not returned in API, only for idempotency
     
     # Relationships
@@ -1,7 +1,8 @@
 """
 SQLAlchemy model for jobs table.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ENUM as PGEnum
 from sqlalchemy.sql import func
 import enum
 
@@ -17,17 +18,26 @@ class JobStatus(str, enum.Enum):
     FAILED = "FAILED"
 
 
+# Native Postgres enum type; it already exists in the database, so no CREATE TYPE is emitted
+_JOB_STATUS = PGEnum(JobStatus, name="jobstatus", create_type=False)
+
+
 class Job(Base):
     """Job model representing the jobs table."""
     
     __tablename__ = "jobs"
+    __table_args__ = (
+        # A user can import a given filename only once; backs the duplicate-file check.
+        # Not created by the app: apply migrations/001_jobs_unique_user_filename.sql
+        UniqueConstraint("job_user_id", "job_original_filename", name="uq_job_user_filename"),
+    )
     
     job_id = Column(Integer, primary_key=True, index=True)
     job_created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     job_user_id = Column(String, nullable=False, index=True)
     job_original_filename = Column(String, nullable=False)
     job_s3_object_key = Column(String, nullable=False)
-    job_status = Column(SQLEnum(JobStatus), nullable=False, index=True)
+    job_status = Column(_JOB_STATUS, nullable=False, index=True)
     job_total_rows = Column(Integer, nullable=False, default=0)
     job_processed_rows = Column(Integer, nullable=False, default=0)
     job_issue_count = Column(Integer, nullable=False, default=0)
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for contact API requests and responses.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from typing import List
 
@@ -21,6 +21,10 @@ class ContactResponse(BaseModel):
         from_attributes = True
 
 
+# Validates a whole list of Contact ORM rows in one call (from_attributes=True)
+CONTACT_LIST_ADAPTER = TypeAdapter(List[ContactResponse])
+
+
 class ContactListResponse(BaseModel):
     """Response schema for list of contacts."""
     contacts: List[ContactResponse]
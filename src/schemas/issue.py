@@ -1,7 +1,7 @@
 """
 Pydantic schemas for issues API requests and responses.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
 from typing import Optional, List
 from src.models.issue import IssueType, StagingStatus
@@ -21,6 +21,10 @@ class StagingRowResponse(BaseModel):
         from_attributes = True
 
 
+# Validates a whole list of Staging ORM rows in one call (from_attributes=True)
+STAGING_ROW_LIST_ADAPTER = TypeAdapter(List[StagingRowResponse])
+
+
 class IssueResponse(BaseModel):
     """Issue response schema (without issue_key)."""
     issue_id: int
@@ -38,14 +42,19 @@ class IssueResponse(BaseModel):
         from_attributes = True
 
 
-class IssueListResponse(BaseModel):
-    """Response schema for list of issues."""
+class JobIssueListResponse(BaseModel):
+    """Response schema for the (unpaginated) list of a job's issues."""
     issues: List[IssueResponse]
     total: int
     resolved_count: int
     unresolved_count: int
 
 
+class IssueListResponse(JobIssueListResponse):
+    """Response schema for a page of a user's issues."""
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, or null on the last page")
+
+
 class IssueUpdateRequest(BaseModel):
     """Request schema for updating an issue."""
     issue_resolved: Optional[bool] = Field(None, description="Whether the issue is resolved")
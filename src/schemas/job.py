@@ -1,9 +1,9 @@
 """
 Pydantic schemas for job API requests and responses.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from src.models.job import JobStatus
 
 
@@ -29,10 +29,15 @@ class JobResponse(JobBase):
         from_attributes = True
 
 
+# Validates a whole list of Job ORM rows in one call (from_attributes=True)
+JOB_LIST_ADAPTER = TypeAdapter(List[JobResponse])
+
+
 class JobListResponse(BaseModel):
     """Response schema for list of jobs."""
     jobs: list[JobResponse]
     total: int
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, or null on the last page")
 
 
 class JobReprocessResponse(BaseModel):
@@ -1,13 +1,17 @@
 """
 Application settings and configuration.
 """
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
+    # Unrelated entries in .env/the environment are ignored instead of rejected
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="ignore")
+    
     # Database
     DATABASE_URL: str
     
@@ -19,6 +23,8 @@ class Settings(BaseSettings):
     # AWS S3
     CSV_BUCKET_NAME: Optional[str] = None
     AWS_REGION: str = "us-east-1"
+    # Store CSVs larger than 64KB zstd-compressed (ContentEncoding=zstd); the worker must support it
+    S3_COMPRESS_UPLOADS: bool = False
     
     # AWS SQS
     SQS_QUEUE_URL: Optional[str] = None
@@ -49,12 +55,23 @@ class Settings(BaseSettings):
     For more information, visit the [main documentation](https://github.com/rpdevelops/data-ingestion-tool).
     """
     
+    # Keyset pagination for list endpoints
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+    
     # Security
     ALLOWED_GROUP: str = "uploader"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings, parsing the environment and .env file only once.
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    Returns:
+        Settings instance
+    """
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()